@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from behave.runner_util import load_step_modules
+from behave.step_registry import registry
+from selenium import webdriver
+from benchmarks.fake_webdriver_server import FakeWebDriverServer
+from main.utils.condition_waits import WaitBudget
+from main.utils.feature_scanner import FeatureScanner
+from main.utils.locator_retrievel.element_cache import ElementCache
+
+RESULTS_FILE = "benchmarks/results/history.jsonl"
+
+PLATFORMS = {
+    "website": {"tag": "@website", "capabilities": {"browserName": "chrome"}},
+    "android": {"tag": "@android", "capabilities": {"platformName": "Android", "automationName": "UiAutomator2"}},
+}
+
+
+class BenchmarkContext:
+    """
+    The attributes of the behave context the step definitions use, without a behave runner.
+    """
+
+    def __init__(self, driver, platform, scenario, use_snapshot=False, element_cache=True):
+        self.driver = driver
+        self.platform = platform
+        self.scenario = scenario
+        self.element_timeout = None
+        self.use_snapshot = use_snapshot
+        self.page_snapshots = {}
+        self.snapshot_reader = False
+        self.element_cache = ElementCache(platform, enabled=element_cache)
+
+
+def start_driver(platform, url):
+    capabilities = PLATFORMS[platform]["capabilities"]
+    if platform == "website":
+        return webdriver.Remote(command_executor=url, desired_capabilities=capabilities)
+    # Appium is only imported by runs that start a mobile session
+    from appium import webdriver as appium_webdriver
+    return appium_webdriver.Remote(command_executor=url, desired_capabilities=capabilities)
+
+
+def load_scenarios(platform):
+    """
+    Returns the behave scenarios of the feature files for the platform, with their background steps.
+    """
+    scanner = FeatureScanner()
+    tag = PLATFORMS[platform]["tag"].lstrip("@")
+    return [
+        scenario for feature in scanner.parse_features() for scenario in feature.scenarios
+        if tag in scenario.effective_tags
+    ]
+
+
+def run_steps(context, steps):
+    """
+    Runs the steps through the real step registry.
+
+    :return: List of (step name, seconds)
+    """
+    timings = []
+    for step in steps:
+        match = registry.find_match(step)
+        if match is None:
+            raise ValueError(f"Undefined step: {step.keyword} {step.name}")
+        context.snapshot_reader = False
+        start = time.perf_counter()
+        # Calls the step function directly: Match.run() needs a full behave Context
+        args = [argument.value for argument in match.arguments if argument.name is None]
+        kwargs = {argument.name: argument.value for argument in match.arguments if argument.name is not None}
+        match.func(context, *args, **kwargs)
+        timings.append((step.name, time.perf_counter() - start))
+        if not context.snapshot_reader:
+            context.page_snapshots.clear()
+    return timings
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(platform, latency, iterations, use_snapshot=False, element_cache=True):
+    """
+    Runs the platform's scenarios 'iterations' times against a local fake WebDriver server.
+
+    :return: Dictionary with steps/sec, per-step overhead, command counts and memory
+    """
+    load_step_modules([os.path.join("features", "steps")])
+    scenarios = load_scenarios(platform)
+    if not scenarios:
+        raise ValueError(f"No scenarios found for platform {platform}")
+
+    with FakeWebDriverServer(latency=latency) as server:
+        driver = start_driver(platform, server.url)
+        server.reset_commands()
+        sleep_before = WaitBudget.report()["sleep_seconds"]
+        tracemalloc.start()
+        start = time.perf_counter()
+        timings = []
+        for _ in range(iterations):
+            for scenario in scenarios:
+                context = BenchmarkContext(driver, platform, scenario, use_snapshot, element_cache)
+                timings += run_steps(context, list(scenario.all_steps))
+        elapsed = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        commands = server.command_count()
+        driver.quit()
+
+    sleep_seconds = WaitBudget.report()["sleep_seconds"] - sleep_before
+    steps = len(timings)
+    # Whatever is not spent waiting on the (simulated) network or in explicit sleeps is framework overhead
+    overhead = max(0.0, elapsed - commands * latency - sleep_seconds)
+    per_step = {}
+    for name, seconds in timings:
+        per_step.setdefault(name, []).append(seconds)
+    return {
+        "platform": platform,
+        "latency": latency,
+        "iterations": iterations,
+        "use_snapshot": use_snapshot,
+        "element_cache": element_cache,
+        "steps": steps,
+        "elapsed_seconds": round(elapsed, 4),
+        "steps_per_second": round(steps / elapsed, 2) if elapsed else None,
+        "commands": commands,
+        "commands_per_step": round(commands / steps, 2) if steps else 0,
+        "sleep_seconds": round(sleep_seconds, 4),
+        "overhead_per_step_ms": round(overhead / steps * 1000, 3) if steps else 0,
+        "peak_memory_kb": round(peak_memory / 1024, 1),
+        "slowest_steps": sorted(
+            ({"step": name, "mean_ms": round(sum(values) / len(values) * 1000, 3)} for name, values in per_step.items()),
+            key=lambda item: item["mean_ms"], reverse=True
+        )[:5],
+    }
+
+
+def load_history(results_file=RESULTS_FILE):
+    if not os.path.exists(results_file):
+        return []
+    with open(results_file, 'r') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def save_result(result, results_file=RESULTS_FILE):
+    os.makedirs(os.path.dirname(results_file), exist_ok=True)
+    with open(results_file, 'a') as file:
+        file.write(json.dumps(result) + "\n")
+
+
+def compare(result, history):
+    """
+    Returns the previous result with the same configuration, or None.
+    """
+    same_config = [
+        previous for previous in history
+        if all(previous.get(key) == result[key] for key in ("platform", "latency", "iterations", "use_snapshot", "element_cache"))
+    ]
+    return same_config[-1] if same_config else None
+
+
+def print_result(result, previous):
+    print(f"\nBenchmark ({result['platform']}, latency {result['latency'] * 1000:.0f} ms, {result['iterations']} iteration(s))")
+    for key in ("steps_per_second", "overhead_per_step_ms", "commands_per_step", "peak_memory_kb"):
+        line = f"{key}: {result[key]}"
+        if previous and previous.get(key):
+            change = (result[key] - previous[key]) / previous[key] * 100
+            line += f" ({change:+.1f}% vs {previous.get('commit') or 'previous run'})"
+        print(line)
+    print("Slowest steps:")
+    for item in result["slowest_steps"]:
+        print(f"{item['mean_ms']:.2f} ms - {item['step']}")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Measure the framework's own overhead against a local fake WebDriver server")
+    parser.add_argument("--platform", choices=sorted(PLATFORMS), default="website")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated latency per command in seconds")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--use-snapshot", action="store_true", help="Answer assertions from page snapshots")
+    parser.add_argument("--no-element-cache", action="store_true", help="Look every element up again instead of reusing it")
+    parser.add_argument("--no-save", action="store_true", help="Do not append the result to the history file")
+    options = parser.parse_args(args)
+
+    result = run_benchmark(
+        options.platform, options.latency, options.iterations, options.use_snapshot, not options.no_element_cache
+    )
+    result["commit"] = git_commit()
+    result["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    history = load_history()
+    print_result(result, compare(result, history))
+    if not options.no_save:
+        save_result(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
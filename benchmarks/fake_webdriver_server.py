@@ -0,0 +1,158 @@
+import base64
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# 1x1 transparent PNG, returned for screenshots
+PNG_PIXEL = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+PAGE_SOURCE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<hierarchy><android.widget.FrameLayout displayed="true" enabled="true">'
+    '<android.widget.TextView text="Continue" displayed="true" enabled="true"/>'
+    '</android.widget.FrameLayout></hierarchy>'
+)
+
+
+class FakeWebDriverServer:
+    """
+    Local stub of a W3C WebDriver/Appium server. Every request is answered after a configurable
+    latency, elements are always found (unless their selector is listed in 'missing'), and every
+    command is logged so callers can count round trips or inspect what was sent.
+    """
+
+    def __init__(self, latency=0.0, missing=None, host="127.0.0.1", port=0):
+        """
+        :param latency: Seconds to wait before answering each request (simulates the network/hub)
+        :param missing: Selector values for which 'no such element' is returned
+        :param host: Interface to listen on
+        :param port: Port to listen on (0 picks a free port)
+        """
+        self.latency = latency
+        self.missing = set(missing or [])
+        self.commands = []  # (method, path, body)
+        self._lock = threading.Lock()
+        self._element_ids = itertools.count(1)
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/wd/hub"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-webdriver", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def command_count(self):
+        with self._lock:
+            return len(self.commands)
+
+    def reset_commands(self):
+        with self._lock:
+            self.commands.clear()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _handle(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                path = self.path.split("/wd/hub", 1)[-1]
+                with server._lock:
+                    server.commands.append((method, path, body))
+                if server.latency:
+                    time.sleep(server.latency)
+                status, value = server.respond(method, path, body)
+                payload = json.dumps({"value": value}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+        return Handler
+
+    def _new_element(self):
+        return {ELEMENT_KEY: f"element-{next(self._element_ids)}"}
+
+    def respond(self, method, path, body):
+        """
+        Returns (HTTP status, value) for a command. Commands without a specific answer return null.
+        """
+        if method == "POST" and path == "/session":
+            capabilities = body.get("capabilities", {}).get("alwaysMatch", {}) or body.get("desiredCapabilities", {})
+            return 200, {"sessionId": uuid.uuid4().hex, "capabilities": capabilities}
+
+        command = re.sub(r"^/session/[^/]+", "", path)
+        if method == "POST" and command in ("/element", "/elements") or re.match(r"^/element/[^/]+/elements?$", command):
+            if body.get("value") in self.missing:
+                if command.endswith("/elements"):
+                    return 200, []
+                return 404, {"error": "no such element", "message": f"Element {body.get('value')} not found", "stacktrace": ""}
+            return 200, [self._new_element()] if command.endswith("/elements") else self._new_element()
+        if re.match(r"^/element/[^/]+/(displayed|enabled)$", command):
+            return 200, True
+        if re.match(r"^/element/[^/]+/text$", command):
+            return 200, "Continue"
+        if re.match(r"^/element/[^/]+/rect$", command) or command == "/window/rect":
+            return 200, {"x": 0, "y": 0, "width": 100, "height": 40}
+        if command == "/screenshot":
+            return 200, base64.b64encode(PNG_PIXEL).decode("ascii")
+        if command == "/source":
+            return 200, PAGE_SOURCE
+        if command == "/title":
+            return 200, "Fake page"
+        if command == "/appium/device/is_keyboard_shown":
+            return 200, True
+        if command == "/execute/sync":
+            return 200, self._execute_script(body.get("script", ""), body.get("args", []))
+        return 200, None
+
+    @staticmethod
+    def _execute_script(script, args):
+        if "document.readyState" in script:
+            return "complete"
+        if "getAnimations" in script:
+            return True
+        if "apply(null, arguments)" in script:
+            # Selenium's isDisplayed atom (WebElement.is_displayed() on web)
+            return True
+        if "var specs" in script and args:
+            # Page snapshot script: every locator is found, visible and enabled
+            return {spec[0]: {"found": True, "displayed": True, "enabled": True, "text": "Continue"} for spec in args[0]}
+        return None
@@ -0,0 +1,97 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# What behave imports before the first scenario runs: the hooks and the step definitions
+HOOKS_SNIPPET = (
+    "import features.environment\n"
+    "from behave.runner_util import load_step_modules\n"
+    "load_step_modules(['features/steps'])\n"
+)
+
+# A behave dry run (behave.ini is skipped so no Allure results are written)
+DRY_RUN_SNIPPET = (
+    "import sys\n"
+    "from behave.__main__ import run_behave\n"
+    "from behave.configuration import Configuration\n"
+    "sys.exit(run_behave(Configuration(['--dry-run', '--format', 'null', '--no-summary'] + sys.argv[1:], load_config=False)))\n"
+)
+
+
+def parse_importtime(stderr):
+    """
+    Parses the output of 'python -X importtime'.
+
+    :return: List of (module, self microseconds, cumulative microseconds, depth)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def measure(mode, platform, paths):
+    """
+    Starts a fresh interpreter with -X importtime and returns (wall seconds, import entries).
+    """
+    snippet = HOOKS_SNIPPET if mode == "hooks" else DRY_RUN_SNIPPET
+    env = dict(os.environ, platform=platform)
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet] + (paths if mode == "dry-run" else []),
+        env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode not in (0, 1):
+        raise RuntimeError(f"Start-up run failed:\n{completed.stderr[-2000:]}")
+    return elapsed, parse_importtime(completed.stderr)
+
+
+def package_breakdown(entries):
+    """Sums the self time of every imported module per top-level package."""
+    packages = {}
+    for name, self_us, _, _ in entries:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Report where behave start-up time goes (python -X importtime)")
+    parser.add_argument("--platform", default="@website", help="Platform tag passed to the hooks")
+    parser.add_argument("--mode", choices=["hooks", "dry-run"], default="hooks",
+                        help="'hooks' imports environment.py and the steps, 'dry-run' runs behave --dry-run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs to take the median wall time from")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("paths", nargs="*", default=["features/feature_files"])
+    options = parser.parse_args(args)
+
+    runs = [measure(options.mode, options.platform, options.paths) for _ in range(max(1, options.repeat))]
+    wall_times = [elapsed for elapsed, _ in runs]
+    entries = runs[-1][1]
+    total_us = sum(self_us for _, self_us, _, _ in entries)
+
+    print(f"Start-up ({options.mode}, {options.platform}): median {statistics.median(wall_times) * 1000:.0f} ms wall, "
+          f"{total_us / 1000:.0f} ms in {len(entries)} imports")
+    print("\nSlowest packages (self time):")
+    for package, self_us in package_breakdown(entries)[:options.top]:
+        print(f"{self_us / 1000:8.1f} ms  {package}")
+    print("\nSlowest top-level imports (cumulative):")
+    top_level = sorted((entry for entry in entries if entry[3] == 0), key=lambda entry: entry[2], reverse=True)
+    for name, _, cumulative_us, _ in top_level[:options.top]:
+        print(f"{cumulative_us / 1000:8.1f} ms  {name}")
+    for package in ("appium", "allure", "webdriver_manager", "lxml"):
+        if any(name == package for name, _, _, _ in entries):
+            print(f"Note: {package} was imported during start-up")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
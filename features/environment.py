@@ -1,18 +1,91 @@
 import logging
 import os
-import time
-import shutil
 from behave import *
+from behave.contrib.scenario_autoretry import patch_scenario_with_autoretry
 from main.utils.platform_handling import PlatformHandling
-from main.utils.test_report import TestReport
-import allure
+from main.utils.test_report import REPORT_FILE, TestReport
+from main.utils.locator_retrievel.locator_registry import LocatorRegistry
+from main.utils.locator_retrievel.element_cache import ElementCache
+from main.utils.session_pool import SessionPool
+from main.utils.results_directory import ResultsDirectory
+from main.utils.artifact_capture import ArtifactCapture
+from main.utils.config_registry import ConfigRegistry
+from main.utils.locator_retrievel.wait_engine import LocatorLatencyHistory, LocatorStrategyStats
+from main.utils.condition_waits import WaitBudget
+from main.utils.metrics import Metrics
+from main.utils.profile_history import ProfileHistory
+from main.utils.command_tracer import CommandTracer
+from main.utils.command_replay import CommandRecorder, CommandReplayer
+from main.utils.cloud_status_reporter import CloudStatusReporter
+from main.utils.driver_binary_resolver import DriverBinaryResolver
+from main.utils.report_stream import ReportStream, ReportAggregator, STREAM_FILE
 
 # Create an instance of the TestReport class
 test_report = TestReport()
 logging.info("TestReport instance created")
 
+# Cloud name/status updates are sent in the background and flushed before a session quits
+cloud_status = CloudStatusReporter()
+
+# Sessions are kept alive between scenarios and quit in after_all; prewarm_sessions=N keeps up to N spare sessions starting
+session_pool = SessionPool(before_quit=cloud_status.flush, max_spare=int(os.environ.get("prewarm_sessions", 0) or 0))
+
+def before_all(context):
+    """Hook that runs once before any scenario"""
+    context.reporter = test_report
+
+    # Capability files are loaded and validated once for the whole run
+    ConfigRegistry.load()
+    # Performance profile(s) merged over the capabilities (profile=fast), the label the latencies are recorded under
+    context.profile = ConfigRegistry.profile_label()
+
+    # Optional tracing of every remote WebDriver command (trace_commands=true)
+    context.trace_commands = CommandTracer.enabled()
+    if context.trace_commands:
+        # Installed before any session starts, so newSession is traced too
+        CommandTracer.install()
+    # Record every command to a file (record_commands=<file>) or serve them back from one (replay_commands=<file>)
+    context.record_commands = CommandRecorder.enabled()
+    context.replay_commands = CommandReplayer.enabled()
+    if context.replay_commands:
+        CommandReplayer.load()
+
+    # The results directory is cleared (or rotated) once per run; the parallel runner passes 'keep'
+    tag = os.environ.get("platform", '')
+    context.results = ResultsDirectory(os.environ.get("results_dir", f'allure-results-{tag}'), os.environ.get("worker_id"))
+    context.results.prepare(os.environ.get("results_mode", "clear"))
+
+    # Scenario results are streamed to one append-only file; the parallel runner passes the shared one
+    context.report_stream = ReportStream(
+        os.environ.get("report_stream") or os.path.join(context.results.subdir(ResultsDirectory.REPORTS_DIR), STREAM_FILE)
+    )
+
+    # Failure screenshots are stored and de-duplicated in the background
+    context.artifacts = ArtifactCapture(context.results.subdir("artifacts"))
+
+    # Failed scenarios are run again up to 'retries' times within the run
+    context.max_attempts = int(os.environ.get("retries", 0) or 0) + 1
+
+def before_feature(context, feature):
+    """Hook that runs before each feature"""
+    if context.max_attempts > 1:
+        for scenario in feature.scenarios:
+            patch_scenario_with_autoretry(scenario, max_attempts=context.max_attempts)
+
+def driver_factory(context, platform, platform_handler):
+    """Returns the callable that starts a new session: from the recording when replaying, otherwise a real driver."""
+    if context.replay_commands:
+        return lambda: CommandReplayer.start_driver(platform, platform_handler.capabilities)
+    return platform_handler.get_driver
+
 def before_scenario(context, scenario):
     """Hook that runs before each scenario"""
+    if context.trace_commands:
+        CommandTracer.begin("scenario", scenario.name)
+
+    # Attempts are counted on the scenario itself, which is run again by the autoretry patch
+    scenario.attempt = getattr(scenario, "attempt", 0) + 1
+
      # Get the tag from the environment variable
     tag = os.environ.get("platform", '')  # Fetch the value of TEST_TAG from environment variable
     environment = os.environ.get("environment", '')  # Fetch the value of TEST_TAG from environment variable
@@ -20,12 +93,6 @@ def before_scenario(context, scenario):
         logging.error("No tag provided, cannot determine the platform.")
         raise ValueError("No tag provided in the environment variable")
 
-    # Delete appropriate allure-results folder based on platform tag
-    allure_dir = f'allure-results-{tag}'
-    if os.path.exists(allure_dir):
-        shutil.rmtree(allure_dir)
-        logging.info(f"Deleted existing {allure_dir} folder")
-
     # Default platform to an empty string
     platform = ''
 
@@ -38,12 +105,41 @@ def before_scenario(context, scenario):
         platform = 'website'
 
     context.platform = platform  # Set the platform to context
+    context.element_timeout = None  # Scenario-wide element wait, set by 'the user sets the element timeout'
+    context.use_snapshot = os.environ.get("use_snapshot", '').lower() == "true"  # Answer assertions from page snapshots
+    context.page_snapshots = {}
+    # Elements resolved in this scenario, reused by later steps until a click, navigation or frame switch
+    context.element_cache = ElementCache(platform, enabled=os.environ.get("element_cache", '').lower() != "false")
 
     if platform:
         # Initialize platform handler and get driver
         logging.info(f"Initializing platform handler for {platform}")
-        platform_handler = PlatformHandling(platform, environment, scenario)
-        context.driver = platform_handler.get_driver()
+        platform_handler = PlatformHandling(platform, environment, scenario, status_reporter=cloud_status)
+        context.fresh_session = SessionPool.FRESH_SESSION_TAG in scenario.effective_tags
+        context.driver = session_pool.acquire(
+            platform, environment, platform_handler.capabilities,
+            driver_factory(context, platform, platform_handler), fresh=context.fresh_session
+        )
+        scenario_key = f"{scenario.feature.filename}:{scenario.name}"
+        if context.record_commands:
+            CommandRecorder.install(context.driver, platform)
+            CommandRecorder.begin(scenario_key)
+        if context.replay_commands:
+            CommandReplayer.begin(scenario_key)
+
+        # The next scenario's session starts in the background; it gets its own handler so the
+        # running scenario's LambdaTest bindings are not touched
+        if session_pool.max_spare:
+            spare_handler = PlatformHandling(platform, environment, scenario, status_reporter=cloud_status)
+            session_pool.prewarm(
+                platform, environment, spare_handler.capabilities, driver_factory(context, platform, spare_handler)
+            )
+
+        # Pooled sessions skip the driver factory, so the cloud session is bound to the scenario here
+        # (only LambdaTest sessions, see LambdaBasicMethod.is_cloud)
+        context.lambda_method = platform_handler.lambda_method
+        context.lambda_method.set_driver(context.driver)
+        context.lambda_method.set_test_name(scenario.name)
         logging.info("Driver initialized successfully")
     else:
         logging.error("No valid platform tag found")
@@ -61,8 +157,12 @@ def after_scenario(context, scenario):
             status = "skipped"
         context.lambda_method.update_test_status(status)
 
-    # Existing code for reporter and screenshots
-    if hasattr(context, 'reporter'):
+    # Existing code for reporter and screenshots; retries are reported apart from first attempts
+    if hasattr(context, 'reporter') and scenario.attempt > 1:
+        final = scenario.status != "failed" or scenario.attempt >= context.max_attempts
+        context.reporter.add_retry(scenario.status.name, final)
+        logging.info(f"Retry attempt {scenario.attempt} {scenario.status.name}")
+    elif hasattr(context, 'reporter'):
         if scenario.status == "passed":
             context.reporter.add_pass()
             logging.info("Scenario passed")
@@ -72,30 +172,102 @@ def after_scenario(context, scenario):
         elif scenario.status == "skipped":
             context.reporter.add_skip()
             logging.warning("Scenario skipped")
+
+    # Each scenario's result is written to its own file and to the report stream as soon as it finishes
+    result = context.results.scenario_result(
+        scenario, platform=context.platform, worker_id=os.environ.get("worker_id"), attempt=scenario.attempt
+    )
+    context.results.write_scenario_result(result)
+    context.report_stream.append(result)
     
-    # Take screenshot for failed scenarios
+    # Take screenshot for failed scenarios, unless the failing step already captured one
     if hasattr(context, 'driver') and scenario.status == "failed":
-        allure.attach(
-            context.driver.get_screenshot_as_png(),
-            name="Scenario Failed",
-            attachment_type=allure.attachment_type.PNG
-        )
+        if not context.artifacts.has_pending(scenario):
+            context.artifacts.capture_screenshot(context.driver, "Scenario Failed", key=scenario)
+        context.artifacts.attach_pending(scenario)
+
+    if context.record_commands:
+        CommandRecorder.end()
+    if context.replay_commands:
+        CommandReplayer.end()
+
+    # Hand the session back to the pool; @fresh_session scenarios never share theirs
+    if hasattr(context, 'driver'):
+        session_pool.release(context.driver, reusable=not context.fresh_session)
+
+    if context.trace_commands:
+        CommandTracer.end("scenario")
 
 def after_all(context):
     """Hook that runs after all scenarios have completed"""
-    if hasattr(context, 'driver'):
-        context.driver.quit()
-        logging.info("Driver quit after all scenarios.")
+    session_pool.quit_all()
+    logging.info("Driver quit after all scenarios.")
+    cloud_status.close()
+
+    context.artifacts.drain()
     
+    logging.info(f"Locator registry stats: {LocatorRegistry.stats()}")
+    logging.info(f"Element cache stats: {ElementCache.stats()}")
+    DriverBinaryResolver.report()
+    LocatorLatencyHistory.save()
+    LocatorStrategyStats.save(context.results.report_path("locator_strategies"))
+    WaitBudget.save(context.results.report_path("wait_budget"))
+
+    # Step and locator latency histograms
+    Metrics.save_json(context.results.report_path("metrics"))
+    Metrics.save_prometheus(context.results.report_path("metrics", "prom"))
+    Metrics.print_summary()
+
+    # Start-up and step latency per performance profile, compared with the latest run of the other profiles.
+    # Parallel workers skip this, the runner records the run once from the metrics of all workers
+    if not os.environ.get("report_stream"):
+        platform = os.environ.get("platform", '').lstrip("@")
+        profile_history = ProfileHistory()
+        profile_history.record(context.profile, platform, os.environ.get("environment", ''))
+        profile_history.print_comparison(platform)
+
+    if context.trace_commands:
+        CommandTracer.save(context.results.report_path("command_trace"))
+    if context.record_commands:
+        CommandRecorder.save()
+    if context.replay_commands:
+        CommandReplayer.save(context.results.report_path("replay"))
+
     # After all tests are complete, print the final report
     logging.info("Generating final test report")
     test_report.print_report()
 
+    # Parallel workers hand their counts back to the runner through their results directory
+    test_report.save(os.path.join(context.results.path, REPORT_FILE))
+
+    # The parallel runner aggregates the shared stream itself
+    if not os.environ.get("report_stream"):
+        aggregator = ReportAggregator(context.report_stream.file_path)
+        aggregator.poll()
+        aggregator.print_summary()
+        aggregator.save(context.results.report_path("summary"))
+
+    if os.environ.get("compact_results", '').lower() == "true":
+        context.results.compact()
+
+
+def before_step(context, step):
+    context.snapshot_reader = False
+    if context.trace_commands:
+        CommandTracer.begin("step", step.name)
+
 
 # adding reporting to take screenshot if the step fails
 def after_step(context, step):
-    if step.status == "failed":
-        timestamp = time.strftime("%Y%m%d-%H%M%S")
-        screenshot_name = f"screenshot_{step.name}_{timestamp}.png"
-        context.driver.save_screenshot(screenshot_name)
-        logging.error(f"Step failed. Screenshot saved as {screenshot_name}")
+    # Page snapshots only stay valid across consecutive steps that read them
+    if not context.snapshot_reader:
+        context.page_snapshots.clear()
+    Metrics.observe(
+        Metrics.STEP_DURATION, step.duration, step=step.name, platform=context.platform, profile=context.profile
+    )
+    if step.status == "failed" and hasattr(context, 'driver'):
+        # Only the screenshot transfer happens here; storing it is done by the background pool
+        context.artifacts.capture_screenshot(context.driver, f"Step failed - {step.name}", key=context.scenario)
+        logging.error(f"Step failed. Screenshot queued for {step.name}")
+    if context.trace_commands:
+        CommandTracer.end("step")
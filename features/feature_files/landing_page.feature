@@ -2,7 +2,7 @@ Feature: Landing Page
     Background: 
         Given the user opens the website
         Given the user switches to iframe "frame_locator" on "landing_page"
-        Then the user waits for 1 seconds
+        Then the user waits for the page to load
 
     @website
     Scenario: User can open the website
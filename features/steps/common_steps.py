@@ -1,32 +1,61 @@
-import time
 from behave import given, when, then
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from main.utils.locator_retrievel.locator_retrieved import LocatorRetrieved
-from main.utils.platform_handling import PlatformHandling
+from main.utils.condition_waits import ConditionWaits, WaitBudget
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+def snapshot_state(context, lr, locator):
+    """
+    Returns the page-snapshot state of a visible element when snapshots are allowed (use_snapshot=true),
+    so assertions can be answered without further remote calls. Returns None when the caller should
+    fall back to a live lookup.
+
+    :param context: The behave context
+    :param lr: The LocatorRetrieved of the page
+    :param locator: The locator name
+    :return: Dictionary with 'displayed', 'enabled' and 'text', or None
+    """
+    context.snapshot_reader = True  # Keeps the page snapshots alive after this step
+    if not context.use_snapshot:
+        return None
+    page_name = lr.page_name.replace('"', '')
+    snapshot = context.page_snapshots.get(page_name)
+    if snapshot is None:
+        snapshot = context.page_snapshots[page_name] = lr.snapshot()
+    state = snapshot.get(locator.strip('"'))
+    if state and state.get("found") and state.get("displayed"):
+        return state
+    # The live lookup will wait for the page to change, which makes this snapshot stale
+    context.page_snapshots.pop(page_name, None)
+    return None
+
 @given(u'the user opens the website')
 def step_impl(context):
     context.driver.get("https://f10boxing.weebly.com/reserve.html#/create-account")
+    context.element_cache.switch_frame(None)  # A new document starts in its top-level frame
     context.driver.maximize_window()
 
 @given(u'the user switches to iframe {frame_locator} on {page_name}')
 def step_impl(context, frame_locator, page_name):
-    lr = LocatorRetrieved(context.driver, page_name, context.platform)
+    lr = LocatorRetrieved(context.driver, page_name, context.platform, context.element_timeout, context.element_cache)
     frame_element = lr.get_element(frame_locator)
     context.driver.switch_to.frame(frame_element)
+    context.element_cache.switch_frame(f"{page_name}.{frame_locator}".replace('"', ''))
 
 @then(u'the user clicks {existence} on {locator} on {page_name}')
 def step_impl(context, existence, locator, page_name):
-    lr = LocatorRetrieved(context.driver, page_name, context.platform)
+    lr = LocatorRetrieved(context.driver, page_name, context.platform, context.element_timeout, context.element_cache)
     existence = existence.lower().replace('"', '')
     try:
-        element = lr.get_element(locator)
+        # Optional elements only get a short wait budget instead of the full timeout
+        element = lr.get_element(locator, optional=existence == "maybe")
         element.click()
+        # The click may re-render or navigate the page
+        context.element_cache.invalidate("click")
     except Exception as e:
         if existence == "surely":
             raise Exception(f"Element {locator} was not found but was expected to exist")
@@ -44,41 +73,43 @@ def step_impl(context, expected_text, locator, page_name):
 def step_impl(context, text, locator, page_name):
     # Pass context.platform to LocatorRetrieved class
     text=(text.lower()).replace('"', '')
-    lr = LocatorRetrieved(context.driver, page_name, context.platform)
+    lr = LocatorRetrieved(context.driver, page_name, context.platform, context.element_timeout, context.element_cache)
     element = lr.get_element(locator)
     element.send_keys(text)
 
 @then(u'the user clicks on enter')
 def step_impl(context):
     context.driver.send_keys(Keys.ENTER)
+    context.element_cache.invalidate("enter key")
 
 @then(u'the user verifies {locator} is {state} on {page_name}')
 def step_impl(context, locator, state, page_name):
-    lr = LocatorRetrieved(context.driver, page_name, context.platform)
-    element = lr.get_element(locator)
+    lr = LocatorRetrieved(context.driver, page_name, context.platform, context.element_timeout, context.element_cache)
+    snapshot = snapshot_state(context, lr, locator)
+    element = None if snapshot else lr.get_element(locator)
     state=(state.lower()).replace('"', '')
     if state == "visible":
-        assert element.is_displayed(), f"Element {locator} is not visible"
+        assert (snapshot["displayed"] if snapshot else element.is_displayed()), f"Element {locator} is not visible"
     elif state == "not-visible":
-        assert not element.is_displayed(), f"Element {locator} is visible but should not be"
+        assert not (snapshot["displayed"] if snapshot else element.is_displayed()), f"Element {locator} is visible but should not be"
     elif state == "enabled":
-        assert element.is_enabled(), f"Element {locator} is not enabled"
+        assert (snapshot["enabled"] if snapshot else element.is_enabled()), f"Element {locator} is not enabled"
     elif state == "disabled":
-        assert not element.is_enabled(), f"Element {locator} is enabled but should be disabled"
+        assert not (snapshot["enabled"] if snapshot else element.is_enabled()), f"Element {locator} is enabled but should be disabled"
     else:
         raise ValueError(f"Invalid state '{state}'. Must be one of: visible, not-visible, enabled, disabled")
 
 @then(u'the user gets text from {locator} on {page_name}')
 def step_impl(context, locator, page_name):
-    lr = LocatorRetrieved(context.driver, page_name, context.platform)
-    element = lr.get_element(locator)
-    context.element_text = element.text
+    lr = LocatorRetrieved(context.driver, page_name, context.platform, context.element_timeout, context.element_cache)
+    snapshot = snapshot_state(context, lr, locator)
+    context.element_text = snapshot["text"] if snapshot else lr.get_element(locator).text
 
 @then(u'the user {state} compare {expected_text} of {locator} on {page_name}')
 def step_impl(context, state, expected_text, locator, page_name):
-    lr = LocatorRetrieved(context.driver, page_name, context.platform)
-    element = lr.get_element(locator)
-    actual_text = element.text
+    lr = LocatorRetrieved(context.driver, page_name, context.platform, context.element_timeout, context.element_cache)
+    snapshot = snapshot_state(context, lr, locator)
+    actual_text = snapshot["text"] if snapshot else lr.get_element(locator).text
     if state == "exactly":
         assert actual_text == expected_text, f"Expected text '{expected_text}' but got '{actual_text}'"
     elif state == "contains":
@@ -88,7 +119,7 @@ def step_impl(context, state, expected_text, locator, page_name):
 
 @then(u'the user scrolls to {locator} on {page_name}')
 def step_impl(context, locator, page_name):
-    lr = LocatorRetrieved(context.driver, page_name, context.platform)
+    lr = LocatorRetrieved(context.driver, page_name, context.platform, context.element_timeout, context.element_cache)
     element = lr.get_element(locator)
     context.driver.execute_script("arguments[0].scrollIntoView(true);", element)
 
@@ -121,17 +152,71 @@ def step_impl(context, x, y):
     else:
         # For web, use JavaScript to create and trigger a click event
         context.driver.execute_script(f"document.elementFromPoint({x}, {y}).click();")
+    context.element_cache.invalidate("click")
+
+@then(u'the user sets the element timeout to {seconds} seconds')
+def step_impl(context, seconds):
+    """
+    Set the wait used by the following element lookups of the scenario
+    :param context: The behave context
+    :param seconds: Timeout in seconds (will be converted from string)
+    """
+    context.element_timeout = float(str(seconds).replace('"', ''))
 
 @then(u'the user waits for {seconds} seconds')
 def step_impl(context, seconds):
     """
-    Pause execution for specified number of seconds using time.sleep()
+    Pause execution for specified number of seconds using WaitBudget.sleep()
+    Prefer a condition wait (page to load, element stable/clickable, animations, keyboard) where possible
     :param context: The behave context
     :param seconds: Number of seconds to sleep (will be converted from string)
     """
     # Remove quotes and convert to float to handle decimal seconds
     seconds = float(str(seconds).replace('"', ''))
-    time.sleep(seconds)
+    # The sleep is accounted per feature file in the wait budget report
+    WaitBudget.sleep(seconds, label=f"{context.scenario.feature.filename}: waits for {seconds:g} seconds")
+
+@then(u'the user waits for the page to load')
+def step_impl(context):
+    """
+    Wait for document.readyState to be complete (returns at once on native apps)
+    """
+    ConditionWaits(context.driver, context.platform, context.element_timeout).page_ready()
+
+@then(u'the user waits for animations to finish')
+def step_impl(context):
+    """
+    Wait until no CSS animation or transition is running on the page
+    """
+    ConditionWaits(context.driver, context.platform, context.element_timeout).no_animations()
+
+@then(u'the user waits for the keyboard to be visible')
+def step_impl(context):
+    """
+    Wait for the on-screen keyboard on Android/iOS
+    """
+    ConditionWaits(context.driver, context.platform, context.element_timeout).keyboard_visible()
+
+@then(u'the user waits for {locator} to be {condition} on {page_name}')
+def step_impl(context, locator, condition, page_name):
+    """
+    Wait for an element to be stable (no longer moving) or clickable
+
+    :param context: The behave context
+    :param locator: The locator name
+    :param condition: One of: stable, clickable
+    :param page_name: The page CSV file name
+    """
+    lr = LocatorRetrieved(context.driver, page_name, context.platform, context.element_timeout, context.element_cache)
+    element = lr.get_element(locator)
+    waits = ConditionWaits(context.driver, context.platform, context.element_timeout)
+    condition = (condition.lower()).replace('"', '')
+    if condition == "stable":
+        waits.element_stable(element)
+    elif condition == "clickable":
+        waits.element_clickable(element)
+    else:
+        raise ValueError(f"Invalid condition '{condition}'. Must be one of: stable, clickable")
 
 
 
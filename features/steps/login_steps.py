@@ -3,7 +3,7 @@ from features.steps.common_steps import *  # Import common steps
 import time
 from behave import given, when, then
 from selenium.webdriver.support import expected_conditions as EC
-from appium.webdriver.common.touch_action import TouchAction
+from main.utils.condition_waits import WaitBudget
 import logging
 import time
 
@@ -36,9 +36,11 @@ def step_impl(context, otp):
     for coord in coordinates:
         x, y = coord
         if context.platform in ["android", "ios"]:
+            from appium.webdriver.common.touch_action import TouchAction  # Only mobile runs load Appium
             actions = TouchAction(context.driver)
             actions.tap(x=x, y=y).perform()  # Using touch action to tap at the specified coordinates
         else:
             context.driver.execute_script(f"document.elementFromPoint({x}, {y}).click();")
         
-        time.sleep(0.5)  # Small delay between clicks
+        WaitBudget.sleep(0.5, label="otp tap interval")  # Small delay between clicks
+    context.element_cache.invalidate("click")
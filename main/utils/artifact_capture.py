@@ -0,0 +1,117 @@
+import base64
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class Artifact:
+    def __init__(self, name, path, digest, duplicate=False):
+        """
+        A screenshot (or other artifact) stored in the run's artifact directory.
+
+        :param name: Display name of the artifact
+        :param path: Path of the stored file
+        :param digest: SHA-256 of the content
+        :param duplicate: True when identical content had already been stored
+        """
+        self.name = name
+        self.path = path
+        self.digest = digest
+        self.duplicate = duplicate
+
+
+class ArtifactCapture:
+    """
+    Captures failure screenshots with a single remote call and hands the bytes to a background
+    thread pool that decodes, de-duplicates (by content hash) and stores them in the run's
+    artifact directory. The calling step only waits for the screenshot to arrive. Each screenshot is
+    decoded once; attaching it to the Allure test only waits for that decode, never for storage.
+    """
+
+    def __init__(self, artifacts_dir, max_workers=2):
+        """
+        :param artifacts_dir: Run-scoped directory the artifacts are written to
+        :param max_workers: Number of background threads
+        """
+        self.artifacts_dir = artifacts_dir
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-capture")
+        self._lock = threading.Lock()
+        self._stored = {}  # digest -> path
+        self._pending = {}  # key -> list of (name, future of the decoded bytes) not attached yet
+        self.captured = 0
+        self.duplicates = 0
+
+    def capture_screenshot(self, driver, name, key=None):
+        """
+        Takes one screenshot and queues it for storage.
+
+        :param driver: The WebDriver instance
+        :param name: Display name of the screenshot
+        :param key: Groups artifacts (e.g. per scenario) so they can be attached together later
+        :return: Future resolving to an Artifact
+        """
+        encoded = driver.get_screenshot_as_base64()
+        decoded = Future()
+        future = self._executor.submit(self._store, name, encoded, "png", decoded)
+        with self._lock:
+            self._pending.setdefault(key, []).append((name, decoded))
+        return future
+
+    def has_pending(self, key):
+        with self._lock:
+            return bool(self._pending.get(key))
+
+    def _store(self, name, encoded, extension, decoded):
+        try:
+            data = base64.b64decode(encoded)
+        except Exception as e:
+            decoded.set_exception(e)
+            raise
+        decoded.set_result(data)  # Attaching can go ahead while the file is written
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self.captured += 1
+            path = self._stored.get(digest)
+            if path:
+                self.duplicates += 1
+                return Artifact(name, path, digest, duplicate=True)
+            path = os.path.join(self.artifacts_dir, f"{digest[:16]}.{extension}")
+            self._stored[digest] = path
+
+        with open(path, 'wb') as file:
+            file.write(data)
+        return Artifact(name, path, digest)
+
+    def attach_pending(self, key):
+        """
+        Attaches the screenshots captured for the given key to the current Allure test, from the bytes
+        the background thread decoded, without waiting for them to be stored.
+        Allure keeps its test context per thread, so attaching happens on the calling (hook) thread.
+
+        :return: Number of attached screenshots
+        """
+        with self._lock:
+            pending = self._pending.pop(key, [])
+        if not pending:
+            return 0
+        import allure  # Only loaded once a failure has something to attach
+        attached = 0
+        for name, decoded in pending:
+            try:
+                data = decoded.result()
+            except Exception as e:
+                logging.error(f"Failed to decode screenshot '{name}': {e}")
+                continue
+            allure.attach(data, name=name, attachment_type=allure.attachment_type.PNG)
+            attached += 1
+        return attached
+
+    def drain(self):
+        """Waits for every queued artifact to be written and stops the thread pool."""
+        self._executor.shutdown(wait=True)
+        logging.info(
+            f"Artifact capture stored {self.captured - self.duplicates} file(s), "
+            f"skipped {self.duplicates} duplicate(s) in {self.artifacts_dir}"
+        )
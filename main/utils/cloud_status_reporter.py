@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+
+
+class CloudStatusReporter:
+    """
+    Sends test name and status updates to the cloud provider (e.g. 'lambda-status=passed') from a
+    background thread, so scenario hooks do not wait on those round trips. Updates queued while the
+    thread is busy are sent as one batch, in order. Status updates are never dropped: each one reports
+    the outcome of a different scenario. A name update only replaces the session's last queued update
+    when that is a name update too.
+    Failed updates are retried; flush() waits until a session's updates are delivered, which the
+    session pool calls before it quits a session.
+    """
+
+    MAX_ATTEMPTS = 3
+    RETRY_DELAY = 0.5  # Seconds, doubled after every failed attempt
+
+    def __init__(self, max_attempts=None, retry_delay=None):
+        """
+        :param max_attempts: How many times an update is sent before it is dropped (default 3)
+        :param retry_delay: Seconds to wait before the first retry (default 0.5)
+        """
+        self.max_attempts = max_attempts or self.MAX_ATTEMPTS
+        self.retry_delay = self.RETRY_DELAY if retry_delay is None else retry_delay
+        self._condition = threading.Condition()
+        self._pending = []  # (driver, kind, script)
+        self._in_flight = set()  # id(driver) of sessions whose batch is being sent
+        self._thread = None
+        self._closed = False
+        self.sent = 0
+        self.failed = 0
+
+    def submit(self, driver, kind, script):
+        """
+        Queues an update for a session.
+
+        :param driver: The WebDriver instance of the session
+        :param kind: The kind of update ('name' or 'status'); a name update replaces a directly preceding queued name update
+        :param script: The script to execute (e.g. 'lambda-status=passed')
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("CloudStatusReporter is closed")
+            queued = [index for index, item in enumerate(self._pending) if item[0] is driver]
+            if kind == "name" and queued and self._pending[queued[-1]][1] == "name":
+                del self._pending[queued[-1]]
+            self._pending.append((driver, kind, script))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cloud-status", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending and self._closed:
+                    return
+                batch, self._pending = self._pending, []
+                self._in_flight = {id(driver) for driver, _, _ in batch}
+            for driver, kind, script in batch:
+                self._send(driver, kind, script)
+            with self._condition:
+                self._in_flight = set()
+                self._condition.notify_all()
+
+    def _send(self, driver, kind, script):
+        delay = self.retry_delay
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                driver.execute_script(script)
+                self.sent += 1
+                logging.info(f"Cloud {kind} update sent: {script}")
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.failed += 1
+                    logging.error(f"Failed to send cloud {kind} update '{script}' after {attempt} attempt(s): {e}")
+                    return
+                logging.warning(f"Cloud {kind} update '{script}' failed (attempt {attempt}), retrying: {e}")
+                time.sleep(delay)
+                delay *= 2
+
+    def _has_pending(self, driver):
+        if driver is None:
+            return bool(self._pending or self._in_flight)
+        return id(driver) in self._in_flight or any(item[0] is driver for item in self._pending)
+
+    def flush(self, driver=None, timeout=30):
+        """
+        Waits until the queued updates of a session (or of every session) have been sent.
+
+        :param driver: The session to flush, or None for all sessions
+        :param timeout: Maximum time to wait in seconds
+        :return: True when everything was delivered in time
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._has_pending(driver):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logging.warning("Timed out waiting for cloud status updates to be sent")
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout=30):
+        """Sends every queued update and stops the background thread."""
+        self.flush(timeout=timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        logging.info(f"Cloud status reporter closed: {self.sent} update(s) sent, {self.failed} failed")
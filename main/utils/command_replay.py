@@ -0,0 +1,370 @@
+import glob
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+# Commands that are not part of a scenario's command sequence: session start/stop, the cloud
+# name/status updates, which are sent from a background thread at no fixed point, and screenshots,
+# which are only taken when something failed and are only attached to reports
+SESSION_COMMANDS = ("newSession", "quit")
+SCRIPT_COMMANDS = ("executeScript", "w3cExecuteScript", "w3cExecuteScriptAsync", "executeAsyncScript")
+SCREENSHOT_COMMANDS = ("screenshot", "elementScreenshot")
+MAX_SCRIPT_LENGTH = 200
+REPLAY_URL = "http://replay.invalid/wd/hub"  # Never contacted, every command is answered from the recording
+
+
+def normalize(payload):
+    """Returns a JSON-only copy of a command's parameters or response (WebElements become their repr)."""
+    return json.loads(json.dumps(payload, default=str))
+
+
+def command_params(params):
+    """
+    Returns the parameters of a command as they are recorded and matched: without the session id, and
+    with long scripts (e.g. Selenium's isDisplayed atom) replaced by their digest to keep recordings small.
+    """
+    params = {key: value for key, value in normalize(params or {}).items() if key != "sessionId"}
+    script = params.get("script")
+    if isinstance(script, str) and len(script) > MAX_SCRIPT_LENGTH:
+        params["script"] = "sha1:" + hashlib.sha1(script.encode("utf-8")).hexdigest()
+    return params
+
+
+def out_of_sequence(command, params):
+    if command in SESSION_COMMANDS or command in SCREENSHOT_COMMANDS:
+        return True
+    return command in SCRIPT_COMMANDS and str((params or {}).get("script", '')).startswith("lambda")
+
+
+class CommandRecorder:
+    """
+    Records every WebDriver/Appium command of a run with its parameters, response and latency, per
+    scenario, into a gzip-compressed JSON file that CommandReplayer can serve back without a browser
+    or device. Enable it with record_commands=<file> (e.g. recordings/website.json.gz); parallel
+    workers write <file>.<worker_id>.
+    """
+
+    RECORD_ENV = "record_commands"
+
+    _lock = threading.Lock()
+    _sessions = {}  # platform -> newSession response
+    _scenarios = {}  # scenario key -> [[command, params, response, milliseconds], ...]
+    _outside = {}  # command -> last response sent outside a scenario
+    scenario = None
+
+    @classmethod
+    def enabled(cls):
+        return bool(os.environ.get(cls.RECORD_ENV))
+
+    @classmethod
+    def file_path(cls):
+        path = os.environ.get(cls.RECORD_ENV)
+        worker_id = os.environ.get("worker_id")
+        return f"{path}.{worker_id}" if worker_id else path
+
+    @classmethod
+    def install(cls, driver, platform):
+        """
+        Wraps the command executor of the driver so every remote command is recorded. Installing twice is a no-op.
+        The session itself was started before the recorder could see it, so its start is recorded from the driver.
+        """
+        executor = driver.command_executor
+        if getattr(executor, "_command_recorder_installed", False):
+            return
+        with cls._lock:
+            cls._sessions.setdefault(platform, {"value": {"sessionId": driver.session_id, "capabilities": normalize(driver.caps)}})
+        original_execute = executor.execute
+
+        def recorded_execute(command, params):
+            start = time.perf_counter()
+            response = original_execute(command, params)
+            cls.record(command, params, response, time.perf_counter() - start)
+            return response
+
+        executor.execute = recorded_execute
+        executor._command_recorder_installed = True
+
+    @classmethod
+    def record(cls, command, params, response, seconds):
+        params = command_params(params)
+        # The driver unwraps the response in place, so it is copied before it is returned
+        response = normalize(response)
+        if command in SCREENSHOT_COMMANDS and isinstance(response, dict):
+            response["value"] = ''
+        with cls._lock:
+            if cls.scenario is None or out_of_sequence(command, params):
+                cls._outside[command] = response
+            else:
+                cls._scenarios[cls.scenario].append([command, params, response, round(seconds * 1000, 1)])
+
+    @classmethod
+    def begin(cls, scenario_key):
+        """Starts the command sequence of a scenario; a retried scenario replaces its earlier attempt."""
+        with cls._lock:
+            cls.scenario = scenario_key
+            cls._scenarios[scenario_key] = []
+
+    @classmethod
+    def end(cls):
+        with cls._lock:
+            cls.scenario = None
+
+    @classmethod
+    def save(cls):
+        path = cls.file_path()
+        with cls._lock:
+            recording = {
+                "version": 1, "sessions": cls._sessions, "scenarios": cls._scenarios, "outside": cls._outside,
+            }
+            commands = sum(len(sequence) for sequence in cls._scenarios.values())
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with gzip.open(path, 'wt', encoding="utf-8") as file:
+            json.dump(recording, file, separators=(",", ":"))
+        logging.info(f"Recorded {commands} command(s) of {len(recording['scenarios'])} scenario(s) to {path}")
+
+
+class ReplayClock:
+    """
+    Virtual time for replays: sleeps on the main thread return at once and advance the clock, and every
+    replayed command advances it by its recorded latency, so waits and polls behave as in the recording.
+    Only the main thread (hooks and steps) sees virtual time, and only while a scenario is replayed;
+    background threads (cloud status updates, pre-warming) keep the real clock.
+    """
+
+    offset = 0.0
+    _originals = None
+
+    @classmethod
+    def install(cls):
+        if cls._originals is not None:
+            return
+        cls._originals = {name: getattr(time, name) for name in ("sleep", "time", "monotonic", "perf_counter")}
+        originals = cls._originals
+
+        def sleep(seconds):
+            if threading.current_thread() is threading.main_thread():
+                cls.advance(seconds)
+            else:
+                originals["sleep"](seconds)
+
+        def virtual(name):
+            def clock():
+                offset = cls.offset if threading.current_thread() is threading.main_thread() else 0.0
+                return originals[name]() + offset
+            return clock
+
+        time.sleep = sleep
+        for name in ("time", "monotonic", "perf_counter"):
+            setattr(time, name, virtual(name))
+
+    @classmethod
+    def advance(cls, seconds):
+        cls.offset += max(0.0, seconds)
+
+    @classmethod
+    def uninstall(cls):
+        if cls._originals is None:
+            return
+        for name, function in cls._originals.items():
+            setattr(time, name, function)
+        cls._originals = None
+
+
+class ReplayConnection:
+    """Stands in for the driver's RemoteConnection; every command is answered by CommandReplayer."""
+
+    def __init__(self, commands, platform):
+        """
+        :param commands: The command table of the connection it replaces (Appium adds its commands to it)
+        :param platform: The platform of the session ('website', 'android', 'ios')
+        """
+        self._commands = commands
+        self.platform = platform
+
+    def execute(self, command, params):
+        return CommandReplayer.serve(command, params, self.platform)
+
+
+def _replay_start_client(driver):
+    # Called by the driver before it starts its session: from here on nothing goes to the network
+    driver.command_executor = ReplayConnection(dict(getattr(driver.command_executor, "_commands", {})), driver.replay_platform)
+
+
+class CommandReplayer:
+    """
+    Serves the commands of a CommandRecorder recording back to the steps through a normal
+    context.driver, with virtual time, so a feature runs in milliseconds without a browser, device
+    or network. Each command is compared with the next one recorded for the scenario; repeated polls
+    are tolerated, anything else is reported as a divergence. A command that cannot be matched at all
+    fails with a WebDriverException. Enable it with replay_commands=<file>.
+    """
+
+    REPLAY_ENV = "replay_commands"
+    LOOKAHEAD = 20
+
+    _lock = threading.Lock()
+    _recording = None
+    _driver_classes = {}
+    scenario = None
+    _cursor = 0
+    _last = None  # The last recorded entry served in the scenario
+    divergences = []
+    replayed = 0
+
+    @classmethod
+    def enabled(cls):
+        return bool(os.environ.get(cls.REPLAY_ENV))
+
+    @classmethod
+    def load(cls):
+        """Loads the recording (and the recordings of parallel workers, <file>.<worker_id>) once."""
+        if cls._recording is not None:
+            return cls._recording
+        path = os.environ.get(cls.REPLAY_ENV)
+        files = sorted(set(glob.glob(path) + glob.glob(f"{path}.*")))
+        if not files:
+            raise FileNotFoundError(f"Command recording '{path}' not found, record one with record_commands={path}")
+        recording = {"sessions": {}, "scenarios": {}, "outside": {}}
+        for file_path in files:
+            with gzip.open(file_path, 'rt', encoding="utf-8") as file:
+                data = json.load(file)
+            for section in recording:
+                recording[section].update(data.get(section, {}))
+        logging.info(f"Loaded {len(recording['scenarios'])} recorded scenario(s) from {', '.join(files)}")
+        cls._recording = recording
+        return recording
+
+    @classmethod
+    def start_driver(cls, platform, capabilities):
+        """
+        Returns a driver of the platform's usual class (Selenium or Appium) whose commands are served from the recording.
+        """
+        cls.load()
+        if platform == "website":
+            from selenium import webdriver
+            base, options = webdriver.Remote, {}
+        else:
+            from appium import webdriver as appium_webdriver
+            base, options = appium_webdriver.Remote, {"direct_connection": False}
+        driver_class = cls._driver_classes.get(platform)
+        if driver_class is None:
+            driver_class = cls._driver_classes[platform] = type(
+                f"Replay{base.__name__}", (base,), {"start_client": _replay_start_client, "replay_platform": platform}
+            )
+        return driver_class(command_executor=REPLAY_URL, desired_capabilities=dict(capabilities), **options)
+
+    @classmethod
+    def begin(cls, scenario_key):
+        with cls._lock:
+            cls.scenario = scenario_key
+            cls._cursor = 0
+            cls._last = None
+            if scenario_key not in cls.load()["scenarios"]:
+                cls._diverge("no recording for this scenario")
+        ReplayClock.install()
+
+    @classmethod
+    def end(cls):
+        """
+        Closes the scenario; recorded commands that were never requested are a divergence.
+        The real clock is restored in any case.
+        """
+        try:
+            with cls._lock:
+                sequence = cls._recording["scenarios"].get(cls.scenario) if cls._recording else None
+                if sequence is not None:
+                    remaining = [entry for entry in sequence[cls._cursor:] if not cls._matches(cls._last, entry[0], entry[1])]
+                    if remaining:
+                        cls._diverge(f"{len(remaining)} recorded command(s) were not replayed, next: {remaining[0][0]}")
+                cls.scenario = None
+        finally:
+            ReplayClock.uninstall()
+
+    @staticmethod
+    def _matches(entry, command, params):
+        return entry is not None and entry[0] == command and entry[1] == params
+
+    @classmethod
+    def _diverge(cls, message, expected=None, actual=None):
+        divergence = {"scenario": cls.scenario, "index": cls._cursor, "message": message}
+        if expected is not None:
+            divergence["expected"] = expected
+        if actual is not None:
+            divergence["actual"] = actual
+        cls.divergences.append(divergence)
+        logging.warning(f"Replay divergence in '{cls.scenario}' at command {cls._cursor}: {message}")
+
+    @classmethod
+    def _respond(cls, entry):
+        cls.replayed += 1
+        ReplayClock.advance(entry[3] / 1000)
+        return normalize(entry[2])
+
+    @classmethod
+    def serve(cls, command, params, platform):
+        """
+        Returns the recorded response for a command.
+
+        :param command: The driver command (e.g. 'findElement')
+        :param params: The command parameters
+        :param platform: The platform of the session
+        """
+        params = command_params(params)
+        with cls._lock:
+            recording = cls.load()
+            if command == "newSession":
+                sessions = recording["sessions"]
+                session = sessions.get(platform) or next(iter(sessions.values()), None)
+                return normalize(session or {"value": {"sessionId": "replay", "capabilities": {}}})
+            sequence = recording["scenarios"].get(cls.scenario) if cls.scenario else None
+            if sequence is None or out_of_sequence(command, params):
+                default = {"value": '' if command in SCREENSHOT_COMMANDS else None}
+                return normalize(recording["outside"].get(command, default))
+
+            # The next recorded command; then a repeated poll, and polls the recording made more of than this run
+            if cls._cursor < len(sequence) and cls._matches(sequence[cls._cursor], command, params):
+                return cls._serve_at(sequence, cls._cursor)
+            if cls._matches(cls._last, command, params):
+                return cls._respond(cls._last)
+            index = cls._cursor
+            while index < len(sequence) and cls._matches(cls._last, sequence[index][0], sequence[index][1]):
+                index += 1
+            if index < len(sequence) and cls._matches(sequence[index], command, params):
+                return cls._serve_at(sequence, index)
+
+            expected = sequence[cls._cursor][:2] if cls._cursor < len(sequence) else None
+            for index in range(cls._cursor, min(len(sequence), cls._cursor + cls.LOOKAHEAD)):
+                if cls._matches(sequence[index], command, params):
+                    cls._diverge(f"{index - cls._cursor} recorded command(s) skipped", expected, [command, params])
+                    return cls._serve_at(sequence, index)
+            cls._diverge("command not in the recording", expected, [command, params])
+            return {
+                "status": 500,
+                "value": {"error": "unknown error", "message": f"Replay diverged: {command} {params} was not recorded", "stacktrace": ''},
+            }
+
+    @classmethod
+    def _serve_at(cls, sequence, index):
+        cls._cursor = index + 1
+        cls._last = sequence[index]
+        return cls._respond(sequence[index])
+
+    @classmethod
+    def save(cls, file_path):
+        """Writes the divergence report and prints a one-line summary."""
+        ReplayClock.uninstall()  # In case the last scenario never reached end()
+        with cls._lock:
+            report = {"replayed_commands": cls.replayed, "divergences": list(cls.divergences)}
+        with open(file_path, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"\nReplayed {report['replayed_commands']} command(s), {len(report['divergences'])} divergence(s) (see {file_path})")
+        for divergence in report["divergences"][:10]:
+            line = f"{divergence['scenario']} @ {divergence['index']}: {divergence['message']}"
+            if "actual" in divergence:
+                line += f" (expected {divergence.get('expected')}, got {divergence['actual']})"
+            print(line)
+        return report
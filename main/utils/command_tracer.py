@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import time
+
+
+class CommandTracer:
+    """
+    Optional tracing of the WebDriver/Appium commands sent to the hub. Every command's name, latency
+    and request/response size is recorded with the scenario and step that sent it, and written at
+    the end of the run as a Chrome trace-event file (open it in chrome://tracing or Perfetto).
+    Commands sent from other threads (pre-warmed sessions, cloud status updates) are labelled
+    'background' and shown on their own thread row, so they are not charged to the running step.
+    Enable it with trace_commands=true.
+    """
+
+    TRACE_ENV = "trace_commands"
+    BACKGROUND = "background"
+
+    _lock = threading.Lock()
+    _events = []
+    _step_counts = {}  # (scenario, step) -> {"commands", "seconds", "bytes"}
+    _named_threads = set()  # ids of the background threads that got a thread_name event
+    _spans = threading.local()  # Per thread: scenario, step and open spans (kind -> (name, start))
+
+    @classmethod
+    def enabled(cls):
+        return os.environ.get(cls.TRACE_ENV, '').lower() == "true"
+
+    @classmethod
+    def install(cls):
+        """
+        Wraps WebDriver.execute for every driver of the process, so each remote command is recorded,
+        including the newSession command sent while a driver is being created and commands that fail.
+        Installing twice is a no-op.
+        """
+        from selenium.webdriver.remote.webdriver import WebDriver
+        if getattr(WebDriver.execute, "_command_tracer_installed", False):
+            return
+        original_execute = WebDriver.execute
+
+        def traced_execute(driver, driver_command, params=None):
+            start = time.time()
+            response = None
+            failed = True
+            try:
+                response = original_execute(driver, driver_command, params)
+                failed = False
+                return response
+            finally:
+                cls.record(driver_command, start, time.time() - start, cls._size(params), cls._size(response), failed)
+
+        traced_execute._command_tracer_installed = True
+        WebDriver.execute = traced_execute
+
+    @staticmethod
+    def _size(payload):
+        try:
+            return len(json.dumps(payload, default=str))
+        except (TypeError, ValueError):
+            return 0
+
+    @classmethod
+    def current(cls):
+        """
+        Returns the (scenario, step) commands of the calling thread are charged to: the open spans
+        on the main thread (which runs the hooks and steps), ('background', thread name) elsewhere.
+        """
+        thread = threading.current_thread()
+        if thread is not threading.main_thread():
+            return cls.BACKGROUND, thread.name
+        return getattr(cls._spans, "scenario", None), getattr(cls._spans, "step", None)
+
+    @classmethod
+    def record(cls, command, start, duration, request_bytes, response_bytes, failed=False):
+        scenario, step = cls.current()
+        tid = threading.get_ident()
+        event = {
+            "name": command,
+            "cat": "webdriver",
+            "ph": "X",
+            "ts": int(start * 1_000_000),
+            "dur": int(duration * 1_000_000),
+            "pid": os.getpid(),
+            "tid": tid,
+            "args": {
+                "scenario": scenario,
+                "step": step,
+                "request_bytes": request_bytes,
+                "response_bytes": response_bytes,
+                "error": failed,
+            },
+        }
+        with cls._lock:
+            if scenario == cls.BACKGROUND and tid not in cls._named_threads:
+                cls._named_threads.add(tid)
+                cls._events.append({
+                    "name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                    "args": {"name": f"{cls.BACKGROUND}: {step}"},
+                })
+            cls._events.append(event)
+            counts = cls._step_counts.setdefault(
+                (scenario, step), {"commands": 0, "errors": 0, "seconds": 0.0, "bytes": 0}
+            )
+            counts["commands"] += 1
+            counts["errors"] += int(failed)
+            counts["seconds"] += duration
+            counts["bytes"] += request_bytes + response_bytes
+
+    @classmethod
+    def begin(cls, kind, name):
+        """
+        Marks the start of a scenario or step; following commands are grouped under it.
+
+        :param kind: 'scenario' or 'step'
+        :param name: The scenario or step name
+        """
+        setattr(cls._spans, kind, name)
+        if not hasattr(cls._spans, "open"):
+            cls._spans.open = {}
+        cls._spans.open[kind] = (name, time.time())
+
+    @classmethod
+    def end(cls, kind):
+        """Closes the scenario or step span opened with begin()."""
+        name, start = getattr(cls._spans, "open", {}).pop(kind, (None, None))
+        if name is not None:
+            with cls._lock:
+                cls._events.append({
+                    "name": name, "cat": kind, "ph": "X",
+                    "ts": int(start * 1_000_000), "dur": int((time.time() - start) * 1_000_000),
+                    "pid": os.getpid(), "tid": threading.get_ident(), "args": {},
+                })
+        setattr(cls._spans, kind, None)
+
+    @classmethod
+    def chattiest_steps(cls, top=5):
+        """Returns the steps that sent the most commands: list of ((scenario, step), counts)."""
+        with cls._lock:
+            items = list(cls._step_counts.items())
+        return sorted(items, key=lambda item: item[1]["commands"], reverse=True)[:top]
+
+    @classmethod
+    def save(cls, file_path):
+        """Writes the Chrome trace-event JSON file and prints the steps with the most round trips."""
+        with cls._lock:
+            events = list(cls._events)
+            commands = sum(counts["commands"] for counts in cls._step_counts.values())
+        with open(file_path, 'w') as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+        print(f"\nWebDriver commands: {commands} (trace written to {file_path})")
+        for (scenario, step), counts in cls.chattiest_steps():
+            errors = f" ({counts['errors']} failed)" if counts["errors"] else ""
+            print(f"{counts['commands']} command(s){errors}, {counts['seconds']:.2f}s, {counts['bytes']} bytes - {scenario} / {step}")
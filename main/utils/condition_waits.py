@@ -0,0 +1,158 @@
+import json
+import logging
+import threading
+import time
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+class WaitBudget:
+    """
+    Accounts for the wall-clock time a run spends in explicit sleeps and in condition waits,
+    so dead time in the suites can be found and removed.
+    """
+
+    _lock = threading.Lock()
+    _sleeps = {}  # label -> {"count", "seconds"}
+    _conditions = {}  # label -> {"count", "seconds", "timeouts"}
+
+    @classmethod
+    def sleep(cls, seconds, label="sleep"):
+        """
+        Sleeps for a fixed time and records it as explicit sleep time.
+
+        :param seconds: Number of seconds to sleep
+        :param label: What the sleep was for (e.g. the step text)
+        """
+        time.sleep(seconds)
+        with cls._lock:
+            entry = cls._sleeps.setdefault(label, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+
+    @classmethod
+    def record_condition(cls, label, seconds, met):
+        """
+        Records the time spent waiting for a condition.
+
+        :param label: The condition (e.g. 'page ready')
+        :param seconds: Time spent waiting
+        :param met: False when the wait timed out
+        """
+        with cls._lock:
+            entry = cls._conditions.setdefault(label, {"count": 0, "seconds": 0.0, "timeouts": 0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            if not met:
+                entry["timeouts"] += 1
+
+    @classmethod
+    def report(cls):
+        with cls._lock:
+            sleeps = {label: dict(entry) for label, entry in cls._sleeps.items()}
+            conditions = {label: dict(entry) for label, entry in cls._conditions.items()}
+        return {
+            "sleep_seconds": sum(entry["seconds"] for entry in sleeps.values()),
+            "condition_wait_seconds": sum(entry["seconds"] for entry in conditions.values()),
+            "sleeps": sleeps,
+            "conditions": conditions,
+        }
+
+    @classmethod
+    def save(cls, file_path):
+        """Writes the wait budget report to a JSON file and logs a one-line summary."""
+        report = cls.report()
+        with open(file_path, 'w') as file:
+            json.dump(report, file, indent=2)
+        logging.info(
+            f"Wait budget: {report['sleep_seconds']:.1f}s in explicit sleeps, "
+            f"{report['condition_wait_seconds']:.1f}s in condition waits (see {file_path})"
+        )
+        return report
+
+
+class ConditionWaits:
+    """
+    Condition-based alternatives to fixed sleeps. Every wait is recorded in the WaitBudget.
+    """
+
+    DEFAULT_TIMEOUT = 10
+    POLL_FREQUENCY = 0.1
+
+    def __init__(self, driver, platform, timeout=None):
+        """
+        :param driver: The WebDriver instance
+        :param platform: The platform ('website', 'android', 'ios')
+        :param timeout: Maximum time to wait for each condition in seconds (default 10)
+        """
+        self.driver = driver
+        self.platform = platform
+        self.timeout = timeout or self.DEFAULT_TIMEOUT
+
+    def until(self, label, condition, message=''):
+        """
+        Waits until the condition returns a truthy value.
+
+        :param label: Name of the condition, used in the wait budget report
+        :param condition: Callable taking the driver
+        :param message: Message of the TimeoutException
+        :return: The value returned by the condition
+        """
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, self.timeout, poll_frequency=self.POLL_FREQUENCY).until(condition, message)
+            WaitBudget.record_condition(label, time.perf_counter() - start, met=True)
+            return result
+        except TimeoutException:
+            WaitBudget.record_condition(label, time.perf_counter() - start, met=False)
+            raise
+
+    def page_ready(self):
+        """Waits for document.readyState to be 'complete'. Native apps have no document, so this returns at once."""
+        if self.platform != "website":
+            return True
+        return self.until(
+            "page ready", lambda driver: driver.execute_script("return document.readyState") == "complete",
+            "Page did not finish loading"
+        )
+
+    def no_animations(self):
+        """Waits until no CSS animation or transition is running on the page."""
+        if self.platform != "website":
+            return True
+        script = (
+            "return !document.getAnimations || "
+            "document.getAnimations().every(function (a) { return a.playState !== 'running'; });"
+        )
+        return self.until("no animations", lambda driver: driver.execute_script(script), "Animations did not finish")
+
+    def element_clickable(self, element):
+        """Waits until the element is displayed and enabled."""
+        def is_clickable(driver):
+            try:
+                return element.is_displayed() and element.is_enabled() and element
+            except StaleElementReferenceException:
+                return False
+
+        return self.until("element clickable", is_clickable, "Element did not become clickable")
+
+    def element_stable(self, element):
+        """Waits until the element keeps the same position and size between two polls."""
+        last_rect = {}
+
+        def is_stable(driver):
+            try:
+                rect = element.rect
+            except StaleElementReferenceException:
+                return False
+            stable = rect == last_rect.get("rect")
+            last_rect["rect"] = rect
+            return stable and element
+
+        return self.until("element stable", is_stable, "Element did not stop moving")
+
+    def keyboard_visible(self):
+        """Waits for the on-screen keyboard on Android/iOS."""
+        if self.platform not in ["android", "ios"]:
+            raise ValueError("Keyboard waits are only supported on android and ios")
+        return self.until("keyboard visible", lambda driver: driver.is_keyboard_shown(), "Keyboard was not shown")
@@ -0,0 +1,141 @@
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from main.utils.json_reader import JSONReader
+
+
+class ConfigRegistry:
+    """
+    Loads and validates every capability file once per process and hands out independent copies,
+    so a scenario can change its capabilities (e.g. 'name') without touching shared state.
+
+    Overrides are read from environment variables:
+      - capabilities_override: JSON merged over the files, e.g. '{"android": {"virtual": {"deviceName": "Pixel 7"}}}'
+      - profile: Named performance profile(s) from profiles.json merged over the capabilities, e.g. 'fast' or 'headless,eager'
+      - LT_USERNAME / LT_ACCESS_KEY: LambdaTest credentials
+    """
+
+    CAPABILITIES_DIR = "main/utils/device_capabilities"
+    PLATFORMS = ("android", "ios", "website")
+    CREDENTIALS_FILE = "lambda_capabilities.json"
+    PROFILES_FILE = "profiles.json"
+    OVERRIDES_ENV = "capabilities_override"
+    PROFILE_ENV = "profile"
+    DEFAULT_PROFILE = "default"
+    CREDENTIAL_ENVS = {"username": "LT_USERNAME", "accessKey": "LT_ACCESS_KEY"}
+
+    _lock = threading.Lock()
+    _platforms = None
+    _credentials = None
+    _profiles = None
+    load_seconds = None
+
+    @classmethod
+    def load(cls, reload=False):
+        """
+        Loads, validates and applies overrides to all capability files. Only the first call reads from disk.
+
+        :param reload: Read the files again even if they were already loaded
+        """
+        with cls._lock:
+            if cls._platforms is not None and not reload:
+                return
+            start = time.perf_counter()
+            platforms = {}
+            for platform in cls.PLATFORMS:
+                data = JSONReader(os.path.join(cls.CAPABILITIES_DIR, f"{platform}.json")).data
+                cls.validate(platform, data)
+                platforms[platform] = data
+
+            overrides = json.loads(os.environ.get(cls.OVERRIDES_ENV) or "{}")
+            for platform, environments in overrides.items():
+                for environment, values in environments.items():
+                    platforms.setdefault(platform, {}).setdefault(environment, {}).update(values)
+
+            profiles_path = os.path.join(cls.CAPABILITIES_DIR, cls.PROFILES_FILE)
+            profiles = JSONReader(profiles_path).data if os.path.exists(profiles_path) else {}
+            for name, profile in profiles.items():
+                cls.validate(f"profile {name}", profile)
+
+            credentials = JSONReader(os.path.join(cls.CAPABILITIES_DIR, cls.CREDENTIALS_FILE)).data
+            for key, env_name in cls.CREDENTIAL_ENVS.items():
+                if os.environ.get(env_name):
+                    credentials[key] = os.environ[env_name]
+
+            cls._platforms = platforms
+            cls._profiles = profiles
+            cls._credentials = credentials
+            cls.load_seconds = time.perf_counter() - start
+            logging.info(f"Loaded capabilities for {', '.join(platforms)} in {cls.load_seconds * 1000:.1f} ms")
+
+    @staticmethod
+    def validate(platform, data):
+        """
+        Checks that a capability file maps each environment to a dictionary of capabilities.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"Capabilities for platform '{platform}' must be a JSON object")
+        for environment, capabilities in data.items():
+            if not isinstance(capabilities, dict):
+                raise ValueError(
+                    f"Capabilities for platform '{platform}' and environment '{environment}' must be a JSON object"
+                )
+
+    @classmethod
+    def get_platform_config(cls, platform):
+        """
+        Returns a copy of the whole capability file of a platform (all environments).
+        """
+        cls.load()
+        if platform not in cls._platforms:
+            raise ValueError(f"No capabilities found for platform '{platform}'")
+        return copy.deepcopy(cls._platforms[platform])
+
+    @classmethod
+    def get_capabilities(cls, platform, environment):
+        """
+        Returns a copy of the capabilities for a platform and environment.
+        """
+        cls.load()
+        capabilities = cls._platforms.get(platform, {}).get(environment)
+        if not capabilities:
+            raise ValueError(f"No capabilities found for platform '{platform}' and environment '{environment}'")
+        capabilities = copy.deepcopy(capabilities)
+        for name in cls.profile_names():
+            for key, value in copy.deepcopy(cls._profiles[name].get(platform, {})).items():
+                # Nested options (e.g. 'lambda:options') are merged rather than replaced
+                if isinstance(value, dict) and isinstance(capabilities.get(key), dict):
+                    capabilities[key].update(value)
+                else:
+                    capabilities[key] = value
+        return capabilities
+
+    @classmethod
+    def profile_names(cls):
+        """
+        Returns the performance profiles selected with the 'profile' environment variable, in merge order.
+        """
+        cls.load()
+        names = [name.strip() for name in os.environ.get(cls.PROFILE_ENV, '').split(",") if name.strip()]
+        unknown = [name for name in names if name not in cls._profiles and name != cls.DEFAULT_PROFILE]
+        if unknown:
+            raise ValueError(
+                f"Unknown profile(s) {', '.join(unknown)}. Must be one of: {', '.join(sorted(cls._profiles))}"
+            )
+        return [name for name in names if name != cls.DEFAULT_PROFILE]
+
+    @classmethod
+    def profile_label(cls):
+        """Returns the name the selected profiles are reported under (e.g. 'fast', 'headless+eager', 'default')."""
+        return "+".join(cls.profile_names()) or cls.DEFAULT_PROFILE
+
+    @classmethod
+    def get_credentials(cls):
+        """
+        Returns the LambdaTest credentials as (username, access_key).
+        """
+        cls.load()
+        return cls._credentials.get("username"), cls._credentials.get("accessKey")
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+
+class DriverBinaryResolver:
+    """
+    Finds the browser driver binary (chromedriver, geckodriver) once per machine and pins it in a local
+    manifest with its SHA-256 checksum and the browser version it was resolved for. Later sessions start
+    from the pinned binary without any download; the webdriver-manager lookup only runs when nothing
+    valid is pinned or the installed browser was updated since (checked once per process).
+
+    Configured with environment variables:
+      - driver_manifest: Manifest path (default: ~/.cache/python_behave/driver_manifest.json)
+      - driver_offline=true: Never use the network; fall back to a driver found on PATH
+    """
+
+    DEFAULT_MANIFEST = os.path.join("~", ".cache", "python_behave", "driver_manifest.json")
+    BINARIES = {"chrome": "chromedriver", "firefox": "geckodriver"}
+    BROWSER_TYPES = {"chrome": "google-chrome", "firefox": "firefox"}  # webdriver-manager browser types
+
+    _lock = threading.Lock()
+    _resolved = {}  # browser -> path, for this process
+    _manifest = None  # The manifest as read once per process
+    saved_seconds = 0.0
+    cache_hits = 0
+
+    @classmethod
+    def manifest_path(cls):
+        return os.path.expanduser(os.environ.get("driver_manifest") or cls.DEFAULT_MANIFEST)
+
+    @staticmethod
+    def offline():
+        return os.environ.get("driver_offline", '').lower() == "true"
+
+    @staticmethod
+    def checksum(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def load_manifest(cls, reload=False):
+        """Returns the manifest, read from disk once per process (or again with reload=True)."""
+        if cls._manifest is None or reload:
+            try:
+                with open(cls.manifest_path(), 'r') as file:
+                    cls._manifest = json.load(file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                cls._manifest = {}
+        return cls._manifest
+
+    @classmethod
+    def save_manifest(cls, manifest):
+        path = cls.manifest_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def resolve(cls, browser):
+        """
+        Returns the path of the driver binary for a browser.
+
+        :param browser: 'chrome' or 'firefox'
+        :return: Path of the verified driver binary
+        """
+        if browser not in cls.BINARIES:
+            raise ValueError(f"No driver binary for browser '{browser}'. Must be one of: {', '.join(cls.BINARIES)}")
+        with cls._lock:
+            manifest = cls.load_manifest()
+            entry = manifest.get(browser) or {}
+            # Checksum and browser version are verified once per process, later sessions reuse the verified path
+            browser_version = None if browser in cls._resolved else cls.browser_version(browser)
+            if browser in cls._resolved or cls.verify(entry, browser_version):
+                # The lookup a pinned binary replaces took resolve_seconds when it was first run
+                cls.cache_hits += 1
+                cls.saved_seconds += entry.get("resolve_seconds", 0.0)
+                cls._resolved.setdefault(browser, entry.get("path"))
+                return cls._resolved[browser]
+
+            start = time.perf_counter()
+            path = cls.lookup(browser)
+            # Read again before writing, so entries pinned meanwhile by other processes are kept
+            manifest = cls.load_manifest(reload=True)
+            manifest[browser] = {
+                "path": path,
+                "sha256": cls.checksum(path),
+                "browser_version": browser_version,
+                "resolve_seconds": round(time.perf_counter() - start, 3),
+                "resolved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            cls.save_manifest(manifest)
+            cls._resolved[browser] = path
+            logging.info(f"Pinned {cls.BINARIES[browser]} at {path} in {cls.manifest_path()}")
+            return path
+
+    @classmethod
+    def verify(cls, entry, browser_version=None):
+        """
+        Checks that a pinned binary still exists, has the pinned checksum and was resolved for the
+        installed browser version (when that version can be detected).
+        """
+        if not entry or not os.path.isfile(entry.get("path", '')):
+            return False
+        if browser_version and entry.get("browser_version") != browser_version:
+            logging.warning(
+                f"Browser version changed from {entry.get('browser_version')} to {browser_version} "
+                f"since {entry['path']} was pinned, resolving it again"
+            )
+            return False
+        if cls.checksum(entry["path"]) != entry.get("sha256"):
+            logging.warning(f"Checksum of pinned driver {entry['path']} changed, resolving it again")
+            return False
+        return True
+
+    @classmethod
+    def browser_version(cls, browser):
+        """
+        Returns the version of the installed browser, or None when it cannot be detected.
+        Only runs the browser's version command, no network access.
+        """
+        try:
+            from webdriver_manager.core.utils import get_browser_version_from_os
+            return get_browser_version_from_os(cls.BROWSER_TYPES[browser])
+        except Exception as e:
+            logging.debug(f"Could not detect the installed {browser} version: {e}")
+            return None
+
+    @classmethod
+    def lookup(cls, browser):
+        """
+        Finds the driver binary: from PATH when offline, with webdriver-manager otherwise.
+        """
+        binary = cls.BINARIES[browser]
+        if cls.offline():
+            path = shutil.which(binary)
+            if not path:
+                raise RuntimeError(
+                    f"driver_offline=true but no pinned {binary} in {cls.manifest_path()} and none found on PATH"
+                )
+            return path
+
+        # webdriver-manager is only needed (and imported) when a binary has to be downloaded
+        if browser == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager().install()
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+
+    @classmethod
+    def report(cls):
+        """Logs how many driver look-ups were served from the manifest and the start-up time they saved."""
+        if cls.cache_hits:
+            logging.info(
+                f"Driver binaries: {cls.cache_hits} start(s) used the pinned binary, "
+                f"saving about {cls.saved_seconds:.1f}s of driver resolution"
+            )
+        return {"cache_hits": cls.cache_hits, "saved_seconds": round(cls.saved_seconds, 3)}
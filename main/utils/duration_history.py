@@ -0,0 +1,120 @@
+import heapq
+import json
+import logging
+import os
+import statistics
+
+
+class DurationHistory:
+    """
+    Local store (JSON lines) of past scenario durations, used to schedule the longest scenarios first
+    and to balance shards across workers or devices.
+    """
+
+    DEFAULT_FILE = ".scenario_durations.jsonl"
+    MAX_SAMPLES = 20  # Samples kept per scenario and platform
+
+    def __init__(self, file_path=None):
+        """
+        :param file_path: The history file (default: the 'duration_history_file' env var or .scenario_durations.jsonl)
+        """
+        self.file_path = file_path or os.environ.get("duration_history_file", self.DEFAULT_FILE)
+        self._records = None
+
+    @staticmethod
+    def make_key(feature_name, scenario_name, platform):
+        # Feature and scenario names survive edits that move the scenario to another line
+        return f"{(platform or '').lstrip('@')}|{feature_name}|{scenario_name}"
+
+    def records(self):
+        """Returns the stored records, oldest first."""
+        if self._records is None:
+            self._records = []
+            if os.path.exists(self.file_path):
+                with open(self.file_path, 'r') as file:
+                    for line in file:
+                        try:
+                            self._records.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            logging.warning(f"Skipping malformed line in {self.file_path}")
+        return self._records
+
+    def record(self, results):
+        """
+        Adds scenario results to the history and keeps the last MAX_SAMPLES per scenario and platform.
+
+        :param results: Scenario result dicts as written by ResultsDirectory (name, feature, location, status, duration, platform)
+        """
+        new_records = [
+            {
+                "key": self.make_key(result.get("feature"), result.get("name"), result.get("platform")),
+                "location": result.get("location"),
+                "platform": result.get("platform"),
+                "status": result.get("status"),
+                "duration": result.get("duration"),
+                "finished_at": result.get("finished_at"),
+            }
+            for result in results if result.get("status") in ("passed", "failed")
+        ]
+        if not new_records:
+            return
+        records = self.records() + new_records
+        kept, counts = [], {}
+        for record in reversed(records):
+            counts[record["key"]] = counts.get(record["key"], 0) + 1
+            if counts[record["key"]] <= self.MAX_SAMPLES:
+                kept.append(record)
+        self._records = list(reversed(kept))
+
+        temp_path = f"{self.file_path}.tmp"
+        with open(temp_path, 'w') as file:
+            file.writelines(json.dumps(record) + "\n" for record in self._records)
+        os.replace(temp_path, self.file_path)
+        logging.info(f"Recorded {len(new_records)} scenario duration(s) in {self.file_path}")
+
+    def estimates(self, platform):
+        """
+        Returns the median past duration of every scenario run on the platform.
+
+        :return: Dictionary of key -> seconds
+        """
+        durations = {}
+        for record in self.records():
+            if (record.get("platform") or '').lstrip('@') == (platform or '').lstrip('@') and record.get("duration") is not None:
+                durations.setdefault(record["key"], []).append(record["duration"])
+        return {key: statistics.median(values) for key, values in durations.items()}
+
+    def schedule(self, scenarios, platform, workers):
+        """
+        Splits scenarios across workers. With history, the longest scenarios are placed first, each on the
+        least loaded worker; scenarios without history count as the median known duration.
+        Without any history, scenarios are dealt round-robin in feature-file order.
+
+        :param scenarios: List of ScenarioRef
+        :param platform: The platform the scenarios run on
+        :param workers: Number of workers (or devices)
+        :return: List of non-empty lists of ScenarioRef, each ordered longest first
+        """
+        workers = max(1, workers)
+        estimates = self.estimates(platform)
+        known = [estimates.get(self.make_key(s.feature_name, s.name, platform)) for s in scenarios]
+        if not any(value is not None for value in known):
+            shards = [scenarios[index::workers] for index in range(workers)]
+            return [shard for shard in shards if shard]
+
+        default = statistics.median(value for value in known if value is not None)
+        weighted = sorted(
+            ((value if value is not None else default, index, scenario) for index, (scenario, value) in enumerate(zip(scenarios, known))),
+            key=lambda item: (-item[0], item[1])
+        )
+        shards = [[] for _ in range(workers)]
+        loads = [(0.0, worker) for worker in range(workers)]
+        for duration, _, scenario in weighted:
+            load, worker = heapq.heappop(loads)
+            shards[worker].append(scenario)
+            heapq.heappush(loads, (load + duration, worker))
+        logging.info(
+            f"Scheduled {len(scenarios)} scenario(s) from history, estimated worker loads: "
+            + ", ".join(f"{load:.1f}s" for load, _ in sorted(loads, key=lambda item: item[1]))
+        )
+        return [shard for shard in shards if shard]
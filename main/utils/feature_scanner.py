@@ -0,0 +1,76 @@
+import glob
+import logging
+import os
+from behave.parser import parse_file
+from behave.tag_expression import TagExpression
+
+
+class ScenarioRef:
+    def __init__(self, location, name, feature_name, tags):
+        """
+        Lightweight reference to a scenario found in a feature file.
+
+        :param location: 'file:line' location of the scenario, as accepted by behave
+        :param name: The scenario name
+        :param feature_name: The name of the feature the scenario belongs to
+        :param tags: Effective tags of the scenario (feature tags included, without '@')
+        """
+        self.location = location
+        self.name = name
+        self.feature_name = feature_name
+        self.tags = tags
+
+    def __repr__(self):
+        return f"ScenarioRef({self.location!r}, {self.name!r})"
+
+
+class FeatureScanner:
+    DEFAULT_PATHS = ["features/feature_files"]
+
+    def __init__(self, paths=None):
+        """
+        Initializes the FeatureScanner with the feature files or directories to scan.
+
+        :param paths: List of feature files or directories (default: features/feature_files)
+        """
+        self.paths = paths or self.DEFAULT_PATHS
+
+    def feature_files(self):
+        """
+        Returns every .feature file below the configured paths, in a stable order.
+        """
+        files = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                files.extend(sorted(glob.glob(os.path.join(path, "**", "*.feature"), recursive=True)))
+            elif os.path.exists(path):
+                files.append(path)
+            else:
+                logging.warning(f"Feature path not found: {path}")
+        return files
+
+    def parse_features(self):
+        """
+        Parses every feature file and returns the behave Feature models.
+        """
+        return [feature for feature in (parse_file(path) for path in self.feature_files()) if feature]
+
+    def discover(self, tags=None):
+        """
+        Finds the scenarios matching the tag expression, in feature-file order.
+
+        :param tags: Tag expression(s) as passed to 'behave --tags' (e.g. '@android' or ['@web', '~@wip'])
+        :return: List of ScenarioRef
+        """
+        if isinstance(tags, str):
+            tags = [tags]
+        tag_expression = TagExpression(tags or [])
+        scenarios = []
+        for feature in self.parse_features():
+            for scenario in feature.scenarios:
+                if tag_expression.check(scenario.effective_tags):
+                    scenarios.append(ScenarioRef(
+                        str(scenario.location), scenario.name, feature.name, sorted(str(tag) for tag in scenario.effective_tags)
+                    ))
+        logging.info(f"Discovered {len(scenarios)} scenario(s) for tags {tags}")
+        return scenarios
@@ -0,0 +1,66 @@
+import logging
+import os
+import time
+
+
+class FileLock:
+    """
+    Cross-process lock for a shared file, held by exclusively creating '<path>.lock'. Parallel workers
+    take it to re-read, merge and replace history files they all update at the end of their run, so
+    the last worker to finish does not overwrite what the others wrote.
+
+    Used as a context manager:
+        with FileLock(path):
+            ...
+    """
+
+    POLL_SECONDS = 0.05
+
+    def __init__(self, path, timeout=30, stale_seconds=120):
+        """
+        :param path: The file to protect; the lock file is created next to it
+        :param timeout: Seconds to wait for the lock before going ahead without it
+        :param stale_seconds: Age after which a left-over lock file (e.g. of a killed worker) is removed
+        """
+        self.lock_path = f"{path}.lock"
+        self.timeout = timeout
+        self.stale_seconds = stale_seconds
+        self._fd = None
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                return True
+            except FileExistsError:
+                self._remove_if_stale()
+            if time.monotonic() >= deadline:
+                logging.warning(f"Timed out waiting for {self.lock_path}, continuing without the lock")
+                return False
+            time.sleep(self.POLL_SECONDS)
+
+    def release(self):
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        try:
+            os.remove(self.lock_path)
+        except FileNotFoundError:
+            pass
+
+    def _remove_if_stale(self):
+        try:
+            if time.time() - os.path.getmtime(self.lock_path) > self.stale_seconds:
+                logging.warning(f"Removing stale lock {self.lock_path}")
+                os.remove(self.lock_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -1,16 +1,17 @@
-import json
 import os
 from datetime import datetime, timedelta
 import logging
+from main.utils.config_registry import ConfigRegistry
 
 class LambdaBasicMethod:
-    def __init__(self, is_jenkins=False, platform='', environment=''):
+    def __init__(self, is_jenkins=False, platform='', environment='', status_reporter=None):
         # Get platform and environment from environment variables, or use provided arguments
         self.platform = os.environ.get("platform", platform).replace('@', '')
         self.environment = os.environ.get("environment", environment)
         self.is_jenkins = is_jenkins  # Flag to check if running in Jenkins or locally
         self.json_file = f"main/utils/device_capabilities/{self.platform}.json"  # Path to the platform-specific JSON file
         self.driver = None  # Add driver attribute
+        self.status_reporter = status_reporter  # CloudStatusReporter sending updates in the background, if any
         
         # Only proceed if the environment is 'virtual'
         if self.environment == "virtual":
@@ -24,11 +25,9 @@ class LambdaBasicMethod:
         self.test_status = "pass"  # Default status is pass
 
     def load_capabilities(self):
-        """Load capabilities from the platform-specific JSON file."""
+        """Load a copy of the platform-specific capabilities from the ConfigRegistry."""
         try:
-            with open(self.json_file, 'r') as file:
-                capabilities = json.load(file)
-                return capabilities
+            return ConfigRegistry.get_platform_config(self.platform)
         except Exception as e:
             logging.error(f"Error loading capabilities from {self.json_file}: {e}")
             raise
@@ -66,28 +65,41 @@ class LambdaBasicMethod:
         else:
             logging.warning(f"Test skipped for scenario: {self.capabilities.get('name', 'Unknown')}")
 
+    def is_cloud(self):
+        """Only virtual Android sessions run on LambdaTest; other virtual runs use local drivers."""
+        return self.platform == "android" and self.environment == "virtual"
+
     def set_driver(self, driver):
-        """Set the WebDriver instance"""
+        """Set the WebDriver instance of a LambdaTest session; other sessions get no lambda-* scripts."""
+        if not self.is_cloud():
+            return
         self.driver = driver
         logging.info("WebDriver instance set in LambdaBasicMethod")
 
+    def execute_lambda_script(self, kind, script):
+        """Sends a lambda-* script through the background status reporter, or directly when there is none."""
+        if self.status_reporter is not None:
+            self.status_reporter.submit(self.driver, kind, script)
+        else:
+            self.driver.execute_script(script)
+
     def set_test_name(self, scenario_name):
         """Set the test name in LambdaTest dashboard"""
-        if self.environment == "virtual" and self.driver:
+        if self.is_cloud() and self.driver:
             try:
                 # Update capabilities
                 self.update_test_details(scenario_name)
                 
                 # Update test name in LambdaTest
                 script = f'lambda-name={scenario_name}'
-                self.driver.execute_script(script)
+                self.execute_lambda_script("name", script)
                 logging.info(f"Test name set to: {scenario_name}")
             except Exception as e:
                 logging.error(f"Failed to set test name in LambdaTest: {e}")
 
     def update_test_status(self, status):
         """Update test status in LambdaTest dashboard"""
-        if self.environment == "virtual" and self.driver:
+        if self.is_cloud() and self.driver:
             try:
                 # Validate status
                 status = status.lower()
@@ -96,7 +108,7 @@ class LambdaBasicMethod:
 
                 # Update status in LambdaTest
                 script = f'lambda-status={status}'
-                self.driver.execute_script(script)
+                self.execute_lambda_script("status", script)
                 
                 # Update local status
                 self.test_status = "pass" if status == "passed" else "fail"
@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+from main.utils.metrics import Metrics
+
+
+class ElementCache:
+    """
+    Elements already resolved in the current scenario, keyed by (page, locator, frame context), so
+    steps that touch the same element again (scroll, verify, then click) skip the find and wait.
+    A cached element is checked with a single is_displayed() call before it is reused; a stale or
+    hidden element is dropped and looked up again. The cache is emptied on navigation, frame
+    switches and clicks.
+
+    Disabled with the environment variable element_cache=false.
+    """
+
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+    stale = 0
+    saved_seconds = 0.0
+
+    def __init__(self, platform, enabled=True):
+        """
+        :param platform: The platform ('website', 'android', 'ios'), used as metric label
+        :param enabled: False to never cache (every lookup goes to the driver)
+        """
+        self.platform = platform
+        self.enabled = enabled
+        self.frame = None  # Frame context: None for the top-level document
+        self._elements = {}  # (page, locator, frame) -> (element, seconds the lookup took)
+
+    def get(self, page_name, locator_name):
+        """
+        Returns the cached element when it is still attached and visible, otherwise None.
+        """
+        if not self.enabled:
+            return None
+        key = (page_name, locator_name, self.frame)
+        cached = self._elements.get(key)
+        if cached is None:
+            self._count("miss")
+            return None
+        element, lookup_seconds = cached
+        start = time.perf_counter()
+        try:
+            usable = element.is_displayed()
+        except (StaleElementReferenceException, WebDriverException):
+            usable = False
+        check_seconds = time.perf_counter() - start
+        if not usable:
+            del self._elements[key]
+            self._count("stale")
+            return None
+        saved = max(0.0, lookup_seconds - check_seconds)
+        self._count("hit", saved)
+        return element
+
+    def put(self, page_name, locator_name, element, lookup_seconds):
+        """
+        Caches a resolved element.
+
+        :param lookup_seconds: How long the lookup took, the time a later hit saves
+        """
+        if self.enabled:
+            self._elements[(page_name, locator_name, self.frame)] = (element, lookup_seconds)
+
+    def invalidate(self, reason):
+        """Drops every cached element (e.g. after a click or navigation)."""
+        if self._elements:
+            logging.debug(f"Element cache cleared after {reason} ({len(self._elements)} element(s))")
+        self._elements.clear()
+
+    def switch_frame(self, frame):
+        """
+        Records a frame switch; elements of the previous frame context are dropped.
+
+        :param frame: Name of the new frame context (e.g. 'checkout_page.payment_frame'), or None for the top-level document
+        """
+        self.invalidate("frame switch")
+        self.frame = frame
+
+    def _count(self, outcome, saved=0.0):
+        with ElementCache._lock:
+            if outcome == "hit":
+                ElementCache.hits += 1
+                ElementCache.saved_seconds += saved
+            elif outcome == "stale":
+                ElementCache.stale += 1
+            else:
+                ElementCache.misses += 1
+        Metrics.increment(Metrics.ELEMENT_CACHE_LOOKUPS, platform=self.platform, outcome=outcome)
+        if saved:
+            Metrics.increment(Metrics.ELEMENT_CACHE_SAVED, saved, platform=self.platform)
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns the cache counters of the run. Every hit is a find and wait that was skipped.
+        """
+        with cls._lock:
+            lookups = cls.hits + cls.misses + cls.stale
+            return {
+                "hits": cls.hits,
+                "misses": cls.misses,
+                "stale": cls.stale,
+                "hit_rate": round(cls.hits / lookups, 3) if lookups else 0.0,
+                "saved_seconds": round(cls.saved_seconds, 3),
+            }
@@ -0,0 +1,147 @@
+import csv
+import logging
+import os
+import threading
+
+
+class LocatorRegistry:
+    """
+    Process-wide cache of parsed locator CSV files.
+
+    Each page file is parsed once and kept as a dictionary of
+    locator_name -> {platform: (locator_type, locator_value), "chains": {platform: [alternatives]}, "timeout": seconds or None}.
+    A cell may list alternative strategies separated by ' || ' (e.g. 'id=skip || xpath=//*[@text="Skip"]');
+    the platform entry holds the first one, "chains" holds all of them in CSV order.
+    A file is only parsed again when its modification time changes on disk.
+    """
+
+    LOCATORS_DIR = "main/locators"
+    PLATFORM_COLUMNS = (("android", 1), ("ios", 2), ("website", 3))
+    TIMEOUT_COLUMN = 4
+    ALTERNATIVE_SEPARATOR = "||"
+
+    _lock = threading.Lock()
+    _pages = {}
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def get_page(cls, page_name):
+        """
+        Returns the parsed locators for the given page, loading the CSV file only on first use
+        or when it has been modified since it was last parsed.
+
+        :param page_name: The name of the page (e.g., 'landing_page')
+        :return: Dictionary of locator_name -> {platform: (locator_type, locator_value) or None}
+        """
+        page_name = page_name.replace('"', '')
+        file_path = os.path.join(cls.LOCATORS_DIR, f"{page_name}.csv")
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Locator file '{file_path}' not found!")
+
+        with cls._lock:
+            cached = cls._pages.get(page_name)
+            if cached and cached[0] == mtime:
+                cls.hits += 1
+                return cached[1]
+
+            cls.misses += 1
+            locators = cls.parse_file(file_path)
+            cls._pages[page_name] = (mtime, locators)
+            logging.info(f"Loaded {len(locators)} locators from {file_path}")
+            return locators
+
+    @classmethod
+    def parse_file(cls, file_path):
+        """
+        Parses a locator CSV file with the format:
+        Locator_Name, Android_Locator, iOS_Locator, Web_Locator, Timeout
+        The Timeout column is optional and overrides the default wait (in seconds) for that locator.
+
+        :param file_path: Path to the CSV file
+        :return: Dictionary of locator_name -> {platform: (locator_type, locator_value) or None,
+                 "chains": {platform: [(locator_type, locator_value), ...]}, "timeout": float or None}
+        """
+        locators = {}
+        with open(file_path, mode='r', newline='') as file:
+            csv_reader = csv.reader(file)
+            next(csv_reader, None)  # Skip header row
+            for row in csv_reader:
+                if not row or not row[0].strip():
+                    continue
+                chains = {
+                    platform: cls.parse_chain(row[index]) if len(row) > index else []
+                    for platform, index in cls.PLATFORM_COLUMNS
+                }
+                locator = {platform: chain[0] if chain else None for platform, chain in chains.items()}
+                locator["chains"] = chains
+                locator["timeout"] = cls.parse_timeout(row[cls.TIMEOUT_COLUMN]) if len(row) > cls.TIMEOUT_COLUMN else None
+                locators[row[0].strip()] = locator
+        return locators
+
+    @staticmethod
+    def parse_locator(raw_value):
+        """
+        Splits a raw locator cell (e.g. 'id=APjFqb') into its type and value.
+
+        :param raw_value: The raw cell value from the CSV file
+        :return: Tuple of (locator_type, locator_value), or None if the cell is empty or malformed
+        """
+        raw_value = raw_value.strip()
+        if "=" not in raw_value:
+            return None
+        locator_type, locator_value = raw_value.split("=", 1)
+        locator_type = locator_type.strip().lower()
+        if not locator_type or not locator_value:
+            return None
+        return locator_type, locator_value
+
+    @classmethod
+    def split_alternatives(cls, raw_value):
+        """Splits a raw locator cell into its alternative 'strategy=value' parts."""
+        return [part.strip() for part in raw_value.split(f" {cls.ALTERNATIVE_SEPARATOR} ") if part.strip()]
+
+    @classmethod
+    def parse_chain(cls, raw_value):
+        """
+        Parses a raw locator cell with one or more alternatives (e.g. 'accessibility_id=Skip || xpath=//...').
+
+        :param raw_value: The raw cell value from the CSV file
+        :return: List of (locator_type, locator_value) in CSV order; malformed alternatives are left out
+        """
+        chain = []
+        for part in cls.split_alternatives(raw_value):
+            alternative = cls.parse_locator(part)
+            if alternative is not None and alternative not in chain:
+                chain.append(alternative)
+        return chain
+
+    @staticmethod
+    def parse_timeout(raw_value):
+        """
+        Parses the optional per-locator timeout column.
+
+        :return: The timeout in seconds, or None if the cell is empty or not a number
+        """
+        try:
+            return float(raw_value.strip())
+        except ValueError:
+            return None
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns the cache counters. Every hit is a CSV file read and parse that was avoided.
+        """
+        with cls._lock:
+            return {"hits": cls.hits, "misses": cls.misses, "pages": len(cls._pages)}
+
+    @classmethod
+    def clear(cls):
+        """Drops every cached page and resets the counters."""
+        with cls._lock:
+            cls._pages.clear()
+            cls.hits = 0
+            cls.misses = 0
@@ -1,54 +1,43 @@
-import csv
+import time
+from main.utils.locator_retrievel.locator_registry import LocatorRegistry
 from main.utils.locator_retrievel.locator_utility import LocatorUtil
+from main.utils.locator_retrievel.page_snapshot import PageSnapshot
+from main.utils.locator_retrievel.wait_engine import LocatorStrategyStats
+from main.utils.metrics import Metrics
 
 class LocatorRetrieved:
-    def __init__(self, driver, page_name, platform):
+    def __init__(self, driver, page_name, platform, timeout=None, element_cache=None):
         """
         Initializes the LocatorRetrieved object with the page name and platform.
         :param page_name: The name of the page (e.g., 'landing_page')
         :param platform: The platform ('web', 'android', 'ios')
+        :param timeout: Default wait in seconds for this page's elements (e.g. set by a step), overrides the CSV timeout
+        :param element_cache: The scenario's ElementCache, or None to always look elements up
         """
         self.driver = driver
         self.page_name = page_name
         self.platform = platform.lower()  # Convert platform to lowercase for consistency
+        self.timeout = timeout
+        self.element_cache = element_cache
         self.locators = self.load_locators()
 
     def load_locators(self):
         """
-        Loads locators from a CSV file based on the page_name.
+        Loads locators for the page_name from the shared LocatorRegistry.
+        The CSV file is only parsed the first time a page is used (or after it changes on disk).
         The CSV file should have the format:
-        Locator_Name, Web_Locator, Android_Locator, iOS_Locator
+        Locator_Name, Android_Locator, iOS_Locator, Web_Locator
         """
-        locators = {}
-        correct_page_name = self.page_name.replace('"', '')
-        file_path = f"main/locators/{correct_page_name}.csv"  # Dynamic file path
-
-        try:
-            with open(file_path, mode='r') as file:
-                csv_reader = csv.reader(file)
-                next(csv_reader)  # Skip header row
-                for row in csv_reader:
-                    locator_name = row[0]
-                    android_locator = row[1].strip() if len(row) > 1 else None
-                    ios_locator = row[2].strip() if len(row) > 2 else None
-                    web_locator = row[3].strip() if len(row) > 3 else None
-
-                    # Add locators to the dictionary
-                    locators[locator_name] = {
-                        "website": web_locator,
-                        "android": android_locator,
-                        "ios": ios_locator
-                    }
+        return LocatorRegistry.get_page(self.page_name)
 
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Locator file '{file_path}' not found!")
-
-        return locators
-
-    def get_element(self, locator_name):
+    def get_element(self, locator_name, timeout=None, optional=False):
         """
         Returns the element for the specified locator_name based on the platform.
         If locator not found, raises an exception.
+
+        :param locator_name: The locator name from the page CSV file
+        :param timeout: Wait in seconds for this lookup; falls back to the page timeout, then the CSV timeout
+        :param optional: True when the element may not exist; only a short wait budget is spent on it
         """
         # Fetch the locator info for the given locator_name
         locator_name = locator_name.strip('"')
@@ -63,8 +52,59 @@ class LocatorRetrieved:
         if not locator_value:
             raise ValueError(f"Locator '{locator_name}' not found for platform '{self.platform}'")
 
-        # Split the locator into type and value (e.g., 'id=APjFqb' becomes 'id' and 'APjFqb')
-        locator_type, locator_value = locator_value.split("=", 1)
+        # The registry already split the locator into type and value (e.g., 'id=APjFqb' is ('id', 'APjFqb')),
+        # and a cell with alternatives ('id=skip || xpath=//...') into a chain of them
+        locator_type, locator_value = locator_value
+        chain = locator_info.get("chains", {}).get(self.platform) or [(locator_type, locator_value)]
         print('locator_name',locator_name,'locator_type',locator_type,'locator_value',locator_value)
-        # Return the element using LocatorUtil.get_element method
-        return LocatorUtil.get_element(self.driver,locator_type, locator_value)
+
+        # Explicit timeout first, then the page timeout, then the Timeout column of the CSV file
+        if timeout is None:
+            timeout = self.timeout if self.timeout is not None else locator_info.get("timeout")
+        page_name = self.page_name.replace('"', '')
+
+        # An element resolved earlier in the scenario is reused while it is still attached and visible
+        start = time.perf_counter()
+        if self.element_cache is not None:
+            element = self.element_cache.get(page_name, locator_name)
+            if element is not None:
+                Metrics.observe(
+                    Metrics.LOCATOR_DURATION, time.perf_counter() - start,
+                    page=page_name, locator=locator_name, platform=self.platform, outcome="cached"
+                )
+                return element
+
+        # Return the element using LocatorUtil.get_element method, timing the lookup per page, locator and platform
+        outcome = "missing"
+        locator_key = f"{page_name}.{locator_name}.{self.platform}"
+        try:
+            element = LocatorUtil.get_element_from_chain(
+                self.driver, chain, timeout=timeout if timeout is not None else 10, optional=optional,
+                locator_key=locator_key
+            )
+            outcome = "found"
+            if self.element_cache is not None:
+                self.element_cache.put(page_name, locator_name, element, time.perf_counter() - start)
+            return element
+        finally:
+            Metrics.observe(
+                Metrics.LOCATOR_DURATION, time.perf_counter() - start,
+                page=page_name, locator=locator_name, platform=self.platform, outcome=outcome
+            )
+
+    def snapshot(self):
+        """
+        Captures the state of every locator of the page for the platform in one round trip.
+        Locators with alternatives are captured with the one that resolved best in earlier lookups.
+        :return: PageSnapshot
+        """
+        page_name = self.page_name.replace('"', '')
+        locators = {}
+        for locator_name, locator_info in self.locators.items():
+            chain = locator_info.get("chains", {}).get(self.platform)
+            if chain:
+                locator_key = f"{page_name}.{locator_name}.{self.platform}"
+                locators[locator_name] = LocatorStrategyStats.order(locator_key, chain)[0]
+            elif locator_info.get(self.platform):
+                locators[locator_name] = locator_info[self.platform]
+        return PageSnapshot.capture(self.driver, page_name, self.platform, locators)
@@ -1,92 +1,120 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webdriver import WebDriver
-from appium.webdriver.common.mobileby import MobileBy
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from main.utils.locator_retrievel.wait_engine import LocatorStrategyStats, WaitEngine
 
 
 class LocatorUtil:
+    LOCATOR_TYPES = {
+        'id': By.ID,
+        'xpath': By.XPATH,
+        'name': By.NAME,
+        'class': By.CLASS_NAME,
+        'css': By.CSS_SELECTOR,
+        'accessibility_id': "accessibility id",  # AppiumBy.ACCESSIBILITY_ID, without importing Appium on web runs
+    }
+
     @staticmethod
-    def get_element(driver, locator_type, locator_value, timeout=10):
+    def get_element(driver, locator_type, locator_value, timeout=10, optional=False, locator_key=None):
         """
         Returns the WebElement based on the provided locator type and value.
         Supports different types of locators such as id, xpath, etc.
-        Waits for element visibility for specified timeout.
-        
+        Tries an immediate lookup first, then waits for element visibility for the specified timeout.
+
         :param locator_type: Type of locator (e.g., 'id', 'xpath', 'name', etc.)
         :param locator_value: The value of the locator (e.g., 'APjFqb', 'xpath=//input[@value="Google Search"]')
         :param timeout: Maximum time to wait for element visibility in seconds (default 10)
+        :param optional: True when the element may not exist; only a short wait budget is spent on it
+        :param locator_key: Key (e.g. 'login_page.skip_button.android') used to learn per-locator latency
         :return: WebElement
         """
-        if locator_type.lower() == 'id':
-            return LocatorUtil.get_element_by_id(driver, locator_value, timeout)
-        elif locator_type.lower() == 'xpath':
-            return LocatorUtil.get_element_by_xpath(driver, locator_value, timeout)
-        elif locator_type.lower() == 'name':
-            return LocatorUtil.get_element_by_name(driver, locator_value, timeout)
-        elif locator_type.lower() == 'class':
-            return LocatorUtil.get_element_by_class_name(driver, locator_value, timeout)
-        elif locator_type.lower() == 'css':
-            return LocatorUtil.get_element_by_css_selector(driver, locator_value, timeout)
-        else:
+        by = LocatorUtil.LOCATOR_TYPES.get(locator_type.lower())
+        if by is None:
             raise ValueError(f"Locator type '{locator_type}' is not supported.")
+        return WaitEngine.wait_for_visible(driver, by, locator_value, timeout, locator_key, optional)
+
+    @staticmethod
+    def get_element_from_chain(driver, chain, timeout=10, optional=False, locator_key=None):
+        """
+        Returns the WebElement for a locator with alternative strategies (e.g. 'id=skip || xpath=//...').
+        The alternatives are tried in the order learned from earlier lookups, and the outcome is recorded
+        so the alternative that resolves most reliably and fastest is tried first next time.
+
+        :param chain: List of (locator_type, locator_value) in CSV order
+        :param timeout: Maximum time to wait for element visibility in seconds (default 10)
+        :param optional: True when the element may not exist; only a short wait budget is spent on it
+        :param locator_key: Key (e.g. 'login_page.skip_button.android') used to learn latency and ordering
+        :return: WebElement
+        """
+        ordered = LocatorStrategyStats.order(locator_key, chain)
+        candidates = []
+        for locator_type, locator_value in ordered:
+            by = LocatorUtil.LOCATOR_TYPES.get(locator_type.lower())
+            if by is None:
+                raise ValueError(f"Locator type '{locator_type}' is not supported.")
+            candidates.append((by, locator_value))
+
+        try:
+            element, index, tried = WaitEngine.wait_for_any_visible(driver, candidates, timeout, locator_key, optional)
+        except Exception as e:
+            if locator_key and hasattr(e, "tried"):
+                LocatorStrategyStats.record(locator_key, chain, {ordered[i]: timing for i, timing in e.tried.items()})
+            raise
+        if locator_key:
+            LocatorStrategyStats.record(
+                locator_key, chain, {ordered[i]: timing for i, timing in tried.items()}, winner=ordered[index]
+            )
+        return element
 
     @staticmethod
     def get_element_by_id(driver, locator_value, timeout=10):
         """
         Retrieves element by ID with wait.
-        
+
         :param locator_value: The ID value (e.g., 'APjFqb')
         :param timeout: Maximum time to wait for element visibility in seconds
         :return: WebElement
         """
-        wait = WebDriverWait(driver, timeout)
-        return wait.until(EC.visibility_of_element_located((By.ID, locator_value)))
+        return WaitEngine.wait_for_visible(driver, By.ID, locator_value, timeout)
 
     @staticmethod
     def get_element_by_xpath(driver, locator_value, timeout=10):
         """
         Retrieves element by XPath with wait.
-        
+
         :param locator_value: The XPath value (e.g., '//input[@value="Google Search"]')
         :param timeout: Maximum time to wait for element visibility in seconds
         :return: WebElement
         """
-        wait = WebDriverWait(driver, timeout)
-        return wait.until(EC.visibility_of_element_located((By.XPATH, locator_value)))
+        return WaitEngine.wait_for_visible(driver, By.XPATH, locator_value, timeout)
 
     @staticmethod
     def get_element_by_name(driver, locator_value, timeout=10):
         """
         Retrieves element by Name with wait.
-        
+
         :param locator_value: The Name value (e.g., 'search')
         :param timeout: Maximum time to wait for element visibility in seconds
         :return: WebElement
         """
-        wait = WebDriverWait(driver, timeout)
-        return wait.until(EC.visibility_of_element_located((By.NAME, locator_value)))
+        return WaitEngine.wait_for_visible(driver, By.NAME, locator_value, timeout)
 
     @staticmethod
     def get_element_by_class_name(driver, locator_value, timeout=10):
         """
         Retrieves element by Class Name with wait.
-        
+
         :param locator_value: The class name value (e.g., 'btn-primary')
         :param timeout: Maximum time to wait for element visibility in seconds
         :return: WebElement
         """
-        wait = WebDriverWait(driver, timeout)
-        return wait.until(EC.visibility_of_element_located((By.CLASS_NAME, locator_value)))
+        return WaitEngine.wait_for_visible(driver, By.CLASS_NAME, locator_value, timeout)
 
     @staticmethod
     def get_element_by_css_selector(driver, locator_value, timeout=10):
         """
         Retrieves element by CSS Selector with wait.
-        
+
         :param locator_value: The CSS selector value (e.g., '.btn-primary')
         :param timeout: Maximum time to wait for element visibility in seconds
         :return: WebElement
         """
-        wait = WebDriverWait(driver, timeout)
-        return wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, locator_value)))
+        return WaitEngine.wait_for_visible(driver, By.CSS_SELECTOR, locator_value, timeout)
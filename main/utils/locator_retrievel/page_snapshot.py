@@ -0,0 +1,161 @@
+import logging
+import xml.etree.ElementTree as ElementTree
+
+_lxml_etree = False  # Not imported yet; None when lxml is not installed
+
+
+def lxml_etree():
+    """Imports lxml (full XPath 1.0 support for Appium page sources) on first use; web runs never need it."""
+    global _lxml_etree
+    if _lxml_etree is False:
+        try:
+            from lxml import etree
+            _lxml_etree = etree
+        except ImportError:
+            _lxml_etree = None
+    return _lxml_etree
+
+# Resolves every locator of a page in the browser and returns its state in one round trip
+SNAPSHOT_SCRIPT = """
+var specs = arguments[0];
+var result = {};
+function find(type, value) {
+    switch (type) {
+        case 'id': return document.getElementById(value);
+        case 'name': return document.getElementsByName(value)[0] || null;
+        case 'class': return document.getElementsByClassName(value)[0] || null;
+        case 'css': return document.querySelector(value);
+        case 'xpath': return document.evaluate(
+            value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return undefined;
+}
+for (var i = 0; i < specs.length; i++) {
+    var name = specs[i][0];
+    try {
+        var element = find(specs[i][1], specs[i][2]);
+        if (element === undefined) { result[name] = null; continue; }
+        if (!element) { result[name] = {found: false}; continue; }
+        var style = window.getComputedStyle(element);
+        var rect = element.getBoundingClientRect();
+        result[name] = {
+            found: true,
+            displayed: style.display !== 'none' && style.visibility !== 'hidden'
+                && parseFloat(style.opacity || '1') > 0 && (rect.width > 0 || rect.height > 0),
+            enabled: !element.disabled,
+            text: (element.innerText || '').trim()
+        };
+    } catch (e) {
+        result[name] = null;
+    }
+}
+return result;
+"""
+
+
+class PageSnapshot:
+    """
+    The state (found, displayed, enabled, text) of every locator of a page, captured at once:
+    with a single execute_script call on the web, or a single page-source fetch on Appium that is
+    evaluated locally. A locator that could not be evaluated has no state, so callers fall back
+    to a live lookup.
+    """
+
+    def __init__(self, page_name, platform, states):
+        """
+        :param page_name: The name of the page (e.g., 'landing_page')
+        :param platform: The platform ('website', 'android', 'ios')
+        :param states: Dictionary of locator_name -> state dictionary, or None when unknown
+        """
+        self.page_name = page_name
+        self.platform = platform
+        self.states = states
+
+    def get(self, locator_name):
+        """
+        Returns the state of a locator: {'found', 'displayed', 'enabled', 'text'}, or None when unknown.
+        """
+        return self.states.get(locator_name)
+
+    @classmethod
+    def capture(cls, driver, page_name, platform, locators):
+        """
+        Captures the state of the given locators.
+
+        :param driver: The WebDriver instance
+        :param page_name: The name of the page
+        :param platform: The platform ('website', 'android', 'ios')
+        :param locators: Dictionary of locator_name -> (locator_type, locator_value)
+        :return: PageSnapshot
+        """
+        if platform == "website":
+            specs = [[name, locator_type, value] for name, (locator_type, value) in locators.items()]
+            states = driver.execute_script(SNAPSHOT_SCRIPT, specs) or {}
+        else:
+            states = cls.evaluate_page_source(driver.page_source, platform, locators)
+        logging.info(f"Captured snapshot of {len(locators)} locator(s) on {page_name}")
+        return cls(page_name, platform, states)
+
+    @classmethod
+    def evaluate_page_source(cls, page_source, platform, locators):
+        """
+        Evaluates the locators against an Appium page source (XML) without further remote calls.
+
+        :return: Dictionary of locator_name -> state dictionary, or None when the locator cannot be evaluated locally
+        """
+        source = page_source.encode("utf-8") if isinstance(page_source, str) else page_source
+        etree = lxml_etree()
+        root = etree.fromstring(source) if etree is not None else ElementTree.fromstring(source)
+        states = {}
+        for name, (locator_type, value) in locators.items():
+            try:
+                nodes = cls.find_nodes(root, platform, locator_type, value)
+            except Exception as e:
+                logging.debug(f"Locator {name} cannot be evaluated on the page source: {e}")
+                nodes = None
+            if nodes is None:
+                states[name] = None
+            elif not nodes:
+                states[name] = {"found": False}
+            else:
+                states[name] = cls.node_state(nodes[0], platform)
+        return states
+
+    @staticmethod
+    def find_nodes(root, platform, locator_type, value):
+        """
+        Finds the page-source nodes matching a locator.
+
+        :return: List of matching nodes, or None when the locator type is not supported locally
+        """
+        id_attribute = "resource-id" if platform == "android" else "name"
+        if locator_type == "xpath":
+            if lxml_etree() is not None:
+                return [node for node in root.xpath(value) if hasattr(node, "attrib")]
+            # ElementTree only understands a subset of XPath, relative to the root
+            return root.findall(f".{value}" if value.startswith("/") else value)
+        if locator_type == "id":
+            return [node for node in root.iter() if node.get(id_attribute) == value]
+        if locator_type == "name":
+            return [node for node in root.iter() if node.get("name") == value]
+        if locator_type == "class":
+            return [node for node in root.iter() if node.tag == value or node.get("class") == value]
+        if locator_type == "accessibility_id":
+            label_attribute = "content-desc" if platform == "android" else "name"
+            return [node for node in root.iter() if node.get(label_attribute) == value]
+        return None
+
+    @staticmethod
+    def node_state(node, platform):
+        if platform == "android":
+            displayed = node.get("displayed", "true") == "true"
+            text = node.get("text", "")
+        else:
+            displayed = node.get("visible", "true") == "true"
+            text = node.get("value") or node.get("label") or ""
+        return {
+            "found": True,
+            "displayed": displayed,
+            "enabled": node.get("enabled", "true") == "true",
+            "text": text,
+        }
@@ -0,0 +1,344 @@
+import json
+import logging
+import os
+import threading
+import time
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from main.utils.file_lock import FileLock
+
+
+class LocatorLatencyHistory:
+    """
+    Remembers how long each locator took to resolve in earlier runs, so waits can be tightened
+    for locators that are normally found instantly. The samples are persisted as JSON; parallel workers
+    merge their new samples into the file under a lock.
+    """
+
+    FILE_ENV = "locator_latency_file"
+    DEFAULT_FILE = ".locator_latency.json"
+    MAX_SAMPLES = 50
+
+    _lock = threading.Lock()
+    _samples = None
+    _new_samples = {}  # locator key -> samples recorded by this process since the last save
+
+    @classmethod
+    def file_path(cls):
+        return os.environ.get(cls.FILE_ENV, cls.DEFAULT_FILE)
+
+    @classmethod
+    def _read(cls):
+        try:
+            with open(cls.file_path(), 'r') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @classmethod
+    def _load(cls):
+        if cls._samples is None:
+            cls._samples = cls._read()
+        return cls._samples
+
+    @classmethod
+    def record(cls, locator_key, seconds):
+        """Adds a successful lookup duration for the locator."""
+        with cls._lock:
+            samples = cls._load().setdefault(locator_key, [])
+            samples.append(round(seconds, 4))
+            del samples[:-cls.MAX_SAMPLES]
+            cls._new_samples.setdefault(locator_key, []).append(round(seconds, 4))
+
+    @classmethod
+    def percentile(cls, locator_key, percent):
+        """
+        Returns the given percentile of the recorded durations, or None when nothing was recorded.
+        """
+        with cls._lock:
+            samples = sorted(cls._load().get(locator_key, []))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    @classmethod
+    def sample_count(cls, locator_key):
+        with cls._lock:
+            return len(cls._load().get(locator_key, []))
+
+    @classmethod
+    def save(cls):
+        """
+        Adds the samples recorded since the last save to the file for the next run. The file is read
+        again under a lock first, so samples saved meanwhile by other workers are kept.
+        """
+        with cls._lock:
+            if not cls._new_samples:
+                return
+            with FileLock(cls.file_path()):
+                samples = cls._read()
+                for locator_key, new_samples in cls._new_samples.items():
+                    merged = samples.setdefault(locator_key, [])
+                    merged.extend(new_samples)
+                    del merged[:-cls.MAX_SAMPLES]
+                temp_path = f"{cls.file_path()}.{os.getpid()}.tmp"
+                with open(temp_path, 'w') as file:
+                    json.dump(samples, file)
+                os.replace(temp_path, cls.file_path())
+            cls._samples = samples
+            cls._new_samples = {}
+
+
+class LocatorStrategyStats:
+    """
+    Remembers, per locator, how often each alternative strategy of its CSV cell resolved the element
+    and how long its find calls took, so later lookups try the most reliable and fastest one first.
+    The counters are persisted as JSON; parallel workers add their counts to the file under a lock.
+    """
+
+    FILE_ENV = "locator_strategy_file"
+    DEFAULT_FILE = ".locator_strategies.json"
+    SLOW_ENV = "slow_locator_seconds"
+    SLOW_FIND_SECONDS = 0.5
+
+    _lock = threading.Lock()
+    _stats = None
+    _new_stats = {}  # Counts recorded by this process since the last save, same layout as _stats
+
+    @classmethod
+    def file_path(cls):
+        return os.environ.get(cls.FILE_ENV, cls.DEFAULT_FILE)
+
+    @classmethod
+    def _read(cls):
+        try:
+            with open(cls.file_path(), 'r') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @classmethod
+    def _load(cls):
+        if cls._stats is None:
+            cls._stats = cls._read()
+        return cls._stats
+
+    @staticmethod
+    def strategy_key(locator_type, locator_value):
+        return f"{locator_type}={locator_value}"
+
+    @staticmethod
+    def score(entry):
+        """Smoothed success rate (higher first), then mean find time (lower first)."""
+        if not entry:
+            return (-0.5, 0.0)
+        mean = entry["find_seconds"] / entry["finds"] if entry["finds"] else 0.0
+        return (-(entry["successes"] + 1) / (entry["attempts"] + 2), mean)
+
+    @classmethod
+    def order(cls, locator_key, chain):
+        """
+        Returns the alternatives of a locator, best first. Alternatives without history keep their CSV order.
+
+        :param locator_key: Key of the locator (e.g. 'login_page.skip_button.android')
+        :param chain: List of (locator_type, locator_value) in CSV order
+        """
+        if len(chain) < 2 or not locator_key:
+            return list(chain)
+        with cls._lock:
+            entries = cls._load().get(locator_key, {})
+            return sorted(chain, key=lambda alternative: cls.score(entries.get(cls.strategy_key(*alternative))))
+
+    @classmethod
+    def record(cls, locator_key, chain, tried, winner=None):
+        """
+        Records the outcome of one lookup.
+
+        :param locator_key: Key of the locator
+        :param chain: List of (locator_type, locator_value) in CSV order
+        :param tried: Dictionary of alternative -> (find calls, seconds spent in them)
+        :param winner: The alternative that resolved the element, or None when none did
+        """
+        with cls._lock:
+            for alternative, (finds, seconds) in tried.items():
+                position = chain.index(alternative) if alternative in chain else None
+                count = {"attempts": 1, "successes": int(alternative == winner), "finds": finds, "find_seconds": seconds}
+                for stats in (cls._load(), cls._new_stats):
+                    cls._add(stats.setdefault(locator_key, {}), cls.strategy_key(*alternative), count, position)
+
+    @staticmethod
+    def _add(entries, strategy, count, position):
+        entry = entries.setdefault(strategy, {"attempts": 0, "successes": 0, "finds": 0, "find_seconds": 0.0})
+        entry["position"] = position
+        entry["attempts"] += count["attempts"]
+        entry["successes"] += count["successes"]
+        entry["finds"] += count["finds"]
+        entry["find_seconds"] = round(entry["find_seconds"] + count["find_seconds"], 4)
+
+    @classmethod
+    def report(cls):
+        """
+        Returns the locators whose element is normally resolved by a slow strategy: one whose find
+        calls average SLOW_FIND_SECONDS or more, or an XPath that is only reached because the
+        alternatives before it in the CSV cell never resolve.
+        """
+        slow_seconds = float(os.environ.get(cls.SLOW_ENV, cls.SLOW_FIND_SECONDS))
+        flagged = []
+        with cls._lock:
+            for locator_key, entries in sorted(cls._load().items()):
+                succeeded = {strategy: entry for strategy, entry in entries.items() if entry["successes"]}
+                if not succeeded:
+                    continue
+                strategy, entry = max(succeeded.items(), key=lambda item: item[1]["successes"])
+                mean = entry["find_seconds"] / entry["finds"] if entry["finds"] else 0.0
+                fell_through = all(position_entry.get("position") for position_entry in succeeded.values())
+                if mean >= slow_seconds or (fell_through and strategy.startswith("xpath=")):
+                    flagged.append({
+                        "locator": locator_key,
+                        "strategy": strategy,
+                        "position": entry.get("position"),
+                        "successes": entry["successes"],
+                        "mean_find_seconds": round(mean, 4),
+                        "fell_through": fell_through,
+                    })
+        return flagged
+
+    @classmethod
+    def save(cls, report_path=None):
+        """
+        Adds the counts recorded since the last save to the file for the next run and, when a path is
+        given, writes the slow-strategy report. The file is read again under a lock first, so counts
+        saved meanwhile by other workers are kept.
+        """
+        with cls._lock:
+            if not cls._new_stats:
+                return []
+            with FileLock(cls.file_path()):
+                stats = cls._read()
+                for locator_key, entries in cls._new_stats.items():
+                    merged = stats.setdefault(locator_key, {})
+                    for strategy, count in entries.items():
+                        cls._add(merged, strategy, count, count.get("position"))
+                temp_path = f"{cls.file_path()}.{os.getpid()}.tmp"
+                with open(temp_path, 'w') as file:
+                    json.dump(stats, file)
+                os.replace(temp_path, cls.file_path())
+            cls._stats = stats
+            cls._new_stats = {}
+        flagged = cls.report()
+        if report_path:
+            with open(report_path, 'w') as file:
+                json.dump(flagged, file, indent=2)
+        for item in flagged:
+            reason = "primary strategy never resolves" if item["fell_through"] else "slow to resolve"
+            logging.warning(
+                f"Locator {item['locator']} resolves through {item['strategy']} "
+                f"({reason}, {item['mean_find_seconds']:.2f}s per find)"
+            )
+        return flagged
+
+
+class WaitEngine:
+    """
+    Waits for an element to become visible. An immediate lookup is tried first, then the poll
+    interval backs off from INITIAL_POLL up to MAX_POLL until the timeout is reached.
+    """
+
+    INITIAL_POLL = 0.05
+    MAX_POLL = 0.5
+    DEFAULT_TIMEOUT = 10
+    OPTIONAL_TIMEOUT = float(os.environ.get("optional_timeout", 2))  # Budget for elements that may not exist
+    ADAPTIVE_ENV = "adaptive_waits"  # 'true' applies learned timeouts to required elements as well
+    ADAPTIVE_MIN_SAMPLES = 5
+    ADAPTIVE_FACTOR = 3
+    ADAPTIVE_FLOOR = 1.0
+
+    @classmethod
+    def effective_timeout(cls, timeout, locator_key=None, optional=False):
+        """
+        Returns the timeout to use for a lookup.
+        Optional elements get a short budget; locators whose history shows they are normally found
+        quickly get a timeout of ADAPTIVE_FACTOR x their p95 (never below ADAPTIVE_FLOOR).
+
+        :param timeout: The requested timeout in seconds
+        :param locator_key: Key of the locator in the latency history
+        :param optional: True when the element is allowed to be missing
+        """
+        if timeout is None:
+            timeout = cls.DEFAULT_TIMEOUT
+        if optional:
+            timeout = min(timeout, cls.OPTIONAL_TIMEOUT)
+        adaptive = optional or os.environ.get(cls.ADAPTIVE_ENV, '').lower() == "true"
+        if adaptive and locator_key and LocatorLatencyHistory.sample_count(locator_key) >= cls.ADAPTIVE_MIN_SAMPLES:
+            p95 = LocatorLatencyHistory.percentile(locator_key, 95)
+            timeout = min(timeout, max(cls.ADAPTIVE_FLOOR, p95 * cls.ADAPTIVE_FACTOR))
+        return timeout
+
+    @classmethod
+    def find_visible(cls, driver, by, value):
+        """
+        Looks the element up once without waiting.
+
+        :return: The element when it is present and visible, otherwise None
+        """
+        try:
+            element = driver.find_element(by, value)
+            return element if element.is_displayed() else None
+        except (NoSuchElementException, StaleElementReferenceException):
+            return None
+
+    @classmethod
+    def wait_for_visible(cls, driver, by, value, timeout=None, locator_key=None, optional=False):
+        """
+        Returns the visible element, polling with back-off until the effective timeout.
+
+        :param driver: The WebDriver instance
+        :param by: Selenium/Appium locator strategy
+        :param value: The locator value
+        :param timeout: Maximum time to wait in seconds (default DEFAULT_TIMEOUT)
+        :param locator_key: Key used to learn and apply per-locator latency
+        :param optional: True when the element is allowed to be missing (short budget)
+        :return: WebElement
+        :raises TimeoutException: When the element is not visible in time
+        """
+        element, _, _ = cls.wait_for_any_visible(driver, [(by, value)], timeout, locator_key, optional)
+        return element
+
+    @classmethod
+    def wait_for_any_visible(cls, driver, candidates, timeout=None, locator_key=None, optional=False):
+        """
+        Returns the first visible element among alternative locators. Every poll round tries each
+        candidate once, in the given order, so a stale first candidate never uses up the whole timeout.
+
+        :param driver: The WebDriver instance
+        :param candidates: List of (by, value) to try, best first
+        :param timeout: Maximum time to wait in seconds (default DEFAULT_TIMEOUT)
+        :param locator_key: Key used to learn and apply per-locator latency
+        :param optional: True when the element is allowed to be missing (short budget)
+        :return: Tuple of (WebElement, index of the candidate that found it, {index: (find calls, seconds)})
+        :raises TimeoutException: When no candidate is visible in time; its 'tried' attribute holds the find timings
+        """
+        timeout = cls.effective_timeout(timeout, locator_key, optional)
+        start = time.perf_counter()
+        deadline = start + timeout
+        poll = cls.INITIAL_POLL
+        tried = {}
+        while True:
+            for index, (by, value) in enumerate(candidates):
+                find_start = time.perf_counter()
+                element = cls.find_visible(driver, by, value)
+                finds, seconds = tried.get(index, (0, 0.0))
+                tried[index] = (finds + 1, seconds + time.perf_counter() - find_start)
+                if element is not None:
+                    if locator_key:
+                        LocatorLatencyHistory.record(locator_key, time.perf_counter() - start)
+                    return element, index, tried
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                description = " or ".join(f"{by}={value}" for by, value in candidates)
+                logging.debug(f"Element {description} not visible after {timeout:.2f}s")
+                error = TimeoutException(f"Element {description} was not visible after {timeout:.2f}s")
+                error.tried = tried
+                raise error
+            time.sleep(min(poll, remaining))
+            poll = min(poll * 2, cls.MAX_POLL)
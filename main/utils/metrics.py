@@ -0,0 +1,231 @@
+import bisect
+import json
+import threading
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram (in seconds). Observing a value is a bisect and a few additions.
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(self.BUCKETS) + 1)  # The last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(self.BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent):
+        """
+        Returns the upper bound of the bucket holding the given percentile (the max for the +Inf bucket).
+        """
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.BUCKETS[index], self.max) if index < len(self.BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "buckets": dict(zip([str(bucket) for bucket in self.BUCKETS] + ["+Inf"], self.bucket_counts)),
+        }
+
+
+class Metrics:
+    """
+    Process-wide registry of latency histograms and counters, keyed by metric name and labels
+    (e.g. step_duration_seconds{step=..., platform=...}). Exported at the end of the run as JSON
+    and as Prometheus text format.
+    """
+
+    STEP_DURATION = "step_duration_seconds"
+    LOCATOR_DURATION = "locator_lookup_seconds"
+    SESSION_STARTUP = "session_startup_seconds"
+    ELEMENT_CACHE_LOOKUPS = "element_cache_lookups_total"
+    ELEMENT_CACHE_SAVED = "element_cache_saved_seconds_total"
+
+    _lock = threading.Lock()
+    _histograms = {}  # (name, labels) -> Histogram
+    _counters = {}  # (name, labels) -> value
+
+    @classmethod
+    def observe(cls, name, seconds, **labels):
+        """
+        Records one duration.
+
+        :param name: Metric name (e.g. 'step_duration_seconds')
+        :param seconds: The measured duration
+        :param labels: Labels of the series (e.g. step, page, locator, platform)
+        """
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        with cls._lock:
+            histogram = cls._histograms.get(key)
+            if histogram is None:
+                histogram = cls._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @classmethod
+    def increment(cls, name, amount=1, **labels):
+        """
+        Adds to a counter.
+
+        :param name: Metric name (e.g. 'element_cache_lookups_total')
+        :param amount: The amount to add
+        :param labels: Labels of the series (e.g. platform, outcome)
+        """
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        with cls._lock:
+            cls._counters[key] = cls._counters.get(key, 0) + amount
+
+    @classmethod
+    def counters(cls, name=None):
+        """
+        Returns a list of (name, labels dict, value), optionally filtered by metric name.
+        """
+        with cls._lock:
+            return [
+                (metric, dict(labels), value)
+                for (metric, labels), value in cls._counters.items() if name is None or metric == name
+            ]
+
+    @classmethod
+    def series(cls, name=None):
+        """
+        Returns a list of (name, labels dict, histogram summary), optionally filtered by metric name.
+        """
+        with cls._lock:
+            return [
+                (metric, dict(labels), histogram.to_dict())
+                for (metric, labels), histogram in cls._histograms.items() if name is None or metric == name
+            ]
+
+    @classmethod
+    def merged(cls, name, **labels):
+        """
+        Returns the summary of all series of a metric whose labels include the given ones, as one histogram
+        (e.g. every step of a profile: merged(STEP_DURATION, profile='fast')).
+        """
+        merged = Histogram()
+        wanted = {label: str(value) for label, value in labels.items()}
+        with cls._lock:
+            for (metric, series_labels), histogram in cls._histograms.items():
+                series_labels = dict(series_labels)
+                if metric != name or any(series_labels.get(label) != value for label, value in wanted.items()):
+                    continue
+                merged.bucket_counts = [a + b for a, b in zip(merged.bucket_counts, histogram.bucket_counts)]
+                merged.count += histogram.count
+                merged.sum += histogram.sum
+                merged.max = max(merged.max, histogram.max)
+        return merged.to_dict()
+
+    @classmethod
+    def slowest(cls, name, top=5):
+        """
+        Returns the series of a metric with the highest total time.
+        """
+        return sorted(cls.series(name), key=lambda item: item[2]["sum"], reverse=True)[:top]
+
+    @classmethod
+    def save_json(cls, file_path):
+        data = [{"name": name, "labels": labels, **summary} for name, labels, summary in cls.series()]
+        counters = [
+            {"name": name, "labels": labels, "value": round(value, 6)} for name, labels, value in cls.counters()
+        ]
+        with open(file_path, 'w') as file:
+            json.dump({"metrics": data, "counters": counters}, file, indent=2)
+
+    @classmethod
+    def load_json(cls, file_path):
+        """
+        Adds the histograms and counters of a file written by save_json (e.g. by a parallel worker)
+        to the registry, so a run's metrics can be summarized across workers.
+        """
+        with open(file_path, 'r') as file:
+            data = json.load(file)
+        with cls._lock:
+            for entry in data.get("metrics", []):
+                key = (entry["name"], tuple(sorted(entry["labels"].items())))
+                histogram = cls._histograms.get(key)
+                if histogram is None:
+                    histogram = cls._histograms[key] = Histogram()
+                buckets = entry.get("buckets", {})
+                histogram.bucket_counts = [
+                    count + buckets.get(bucket, 0)
+                    for count, bucket in zip(histogram.bucket_counts, [str(bucket) for bucket in Histogram.BUCKETS] + ["+Inf"])
+                ]
+                histogram.count += entry["count"]
+                histogram.sum += entry["sum"]
+                histogram.max = max(histogram.max, entry["max"])
+            for entry in data.get("counters", []):
+                key = (entry["name"], tuple(sorted(entry["labels"].items())))
+                cls._counters[key] = cls._counters.get(key, 0) + entry["value"]
+
+    @classmethod
+    def save_prometheus(cls, file_path):
+        """Writes every histogram and counter in the Prometheus text exposition format."""
+        lines = []
+        with cls._lock:
+            items = sorted(cls._histograms.items())
+            counters = sorted(cls._counters.items())
+        typed = set()
+        for (name, labels), histogram in items:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bucket, bucket_count in zip([str(bucket) for bucket in Histogram.BUCKETS] + ["+Inf"], histogram.bucket_counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{cls._format_labels(labels + (('le', bucket),))} {cumulative}")
+            lines.append(f"{name}_sum{cls._format_labels(labels)} {histogram.sum}")
+            lines.append(f"{name}_count{cls._format_labels(labels)} {histogram.count}")
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{cls._format_labels(labels)} {value}")
+        with open(file_path, 'w') as file:
+            file.write("\n".join(lines) + "\n")
+
+    @staticmethod
+    def _format_labels(labels):
+        if not labels:
+            return ""
+        escaped = [
+            (label, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for label, value in labels
+        ]
+        return "{" + ",".join(f'{label}="{value}"' for label, value in escaped) + "}"
+
+    @classmethod
+    def print_summary(cls, top=5):
+        """Prints the slowest steps and locators of the run."""
+        for name, title in ((cls.STEP_DURATION, "Steps"), (cls.LOCATOR_DURATION, "Locators")):
+            slowest = cls.slowest(name, top)
+            if not slowest:
+                continue
+            print(f"\nSlowest {title}:")
+            for _, labels, summary in slowest:
+                description = ", ".join(f"{label}={value}" for label, value in labels.items())
+                print(f"{summary['sum']:.2f}s total, {summary['count']} call(s), p95 {summary['p95']:.2f}s - {description}")
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._histograms.clear()
+            cls._counters.clear()
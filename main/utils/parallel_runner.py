@@ -0,0 +1,310 @@
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from main.utils.config_registry import ConfigRegistry
+from main.utils.duration_history import DurationHistory
+from main.utils.feature_scanner import FeatureScanner
+from main.utils.metrics import Metrics
+from main.utils.preflight import PreflightValidator
+from main.utils.profile_history import ProfileHistory
+from main.utils.report_stream import ReportAggregator, STREAM_FILE
+from main.utils.results_directory import ResultsDirectory
+from main.utils.selection_index import SelectionIndex
+from main.utils.test_report import REPORT_FILE, TestReport
+
+ALLURE_FORMATTER = "allure_behave.formatter:AllureFormatter"
+LOG_FILE = "behave.log"
+
+
+def preserve_order(locations):
+    """
+    Returns scenario locations that behave runs in the given order. behave merges consecutive
+    locations of one feature file and runs them in line order, so a location that would be moved
+    ahead of the one before it is given in the other path form (absolute instead of relative, or
+    back), which behave runs as a separate pass over the feature.
+
+    :param locations: List of 'file:line' scenario locations, in the order they should run
+    :return: List of 'file:line' locations
+    """
+    ordered = []
+    previous_path, previous_line, form = None, None, 0
+    for location in locations:
+        path, _, line = location.rpartition(":")
+        if not path or not line.isdigit():
+            ordered.append(location)
+            previous_path = None
+            continue
+        if path != previous_path:
+            form = 0
+        elif int(line) <= previous_line:
+            form = 1 - form
+        forms = (path, os.path.relpath(path) if os.path.isabs(path) else os.path.abspath(path))
+        ordered.append(f"{forms[form]}:{line}")
+        previous_path, previous_line = path, int(line)
+    return ordered
+
+
+def run_worker(locations, env):
+    """
+    Runs one shard of scenarios with behave inside a worker process.
+    Each worker gets its own environment variables, driver and results directory.
+
+    :param locations: List of 'file:line' scenario locations to run
+    :param env: Environment variables for the worker (platform, environment, results_dir, ...)
+    :return: behave exit code
+    """
+    from behave.__main__ import run_behave
+    from behave.configuration import Configuration
+
+    os.environ.update(env)
+    results_dir = env["results_dir"]
+    os.makedirs(results_dir, exist_ok=True)
+    # --no-skipped: the scenarios outside the shard are skipped by behave and must not get an Allure result
+    args = [
+        "--no-skipped",
+        "--format", ALLURE_FORMATTER, "--outfile", results_dir,
+        "--format", "plain", "--outfile", os.path.join(results_dir, LOG_FILE),
+    ] + preserve_order(locations)
+    # behave.ini is skipped on purpose: its format/outfiles would be appended to the ones above
+    return run_behave(Configuration(args, load_config=False))
+
+
+class ParallelRunner:
+    def __init__(self, platform, environment=None, tags=None, workers=1, paths=None, results_dir=None,
+                 results_mode="clear", compact=False, history_file=None, retries=0, rerun_failed=False,
+                 rerun_file=None, changes=None, preflight=True, preflight_only=False,
+                 live_interval=0):
+        """
+        Initializes the ParallelRunner.
+
+        :param platform: The platform tag (e.g. '@android', '@ios', '@website')
+        :param environment: The environment ('local' or 'virtual'), defaults to the 'environment' env var
+        :param tags: Tag expression selecting scenarios (defaults to the platform tag)
+        :param workers: Number of worker processes
+        :param paths: Feature files or directories to scan
+        :param results_dir: Directory receiving the merged Allure results
+        :param results_mode: How previous results are handled once per run ('clear' or 'rotate')
+        :param compact: Pack the merged JSON results into one indexed archive at the end
+        :param history_file: Scenario duration history used for scheduling (default: .scenario_durations.jsonl)
+        :param retries: How many times a failed scenario is run again within the run
+        :param rerun_failed: Only run the scenarios listed in the rerun manifest of the previous run
+        :param rerun_file: The rerun manifest (default: rerun-<platform>.txt)
+        :param changes: Changed files or locator rows; only the scenarios affected by them are run
+        :param preflight: Validate steps, locators and capabilities before any session is opened
+        :param preflight_only: Stop after the preflight validation
+        :param live_interval: Print a live summary every this many seconds while the workers run (0 disables it)
+        """
+        self.platform = platform
+        self.environment = environment if environment is not None else os.environ.get("environment", '')
+        self.tags = tags or platform
+        self.workers = max(1, int(workers))
+        self.paths = paths
+        self.results_dir = results_dir or f"allure-results-{platform}"
+        self.workers_dir = f"{self.results_dir}-workers"
+        self.results_mode = results_mode
+        self.compact = compact
+        self.history = DurationHistory(history_file)
+        self.retries = max(0, int(retries))
+        self.rerun_failed = rerun_failed
+        self.rerun_file = rerun_file or f"rerun-{platform}.txt"
+        self.changes = changes
+        self.preflight = preflight or preflight_only
+        self.preflight_only = preflight_only
+        self.live_interval = live_interval
+        self.stream_file = os.path.abspath(os.path.join(self.results_dir, ResultsDirectory.REPORTS_DIR, STREAM_FILE))
+        self._index = None
+
+    def selection_index(self):
+        """The scenario index shared by change-based selection and the preflight, built once per run."""
+        if self._index is None:
+            self._index = SelectionIndex(self.paths).build()
+        return self._index
+
+    def shard(self, scenarios):
+        """
+        Splits scenarios across the workers: longest first and balanced by past durations when there
+        is history, round-robin in feature-file order otherwise.
+
+        :return: List of non-empty lists of scenario locations
+        """
+        shards = self.history.schedule(scenarios, self.platform, self.workers)
+        return [[scenario.location for scenario in shard] for shard in shards]
+
+    def worker_env(self, worker_id):
+        return {
+            "platform": self.platform,
+            "environment": self.environment,
+            "worker_id": str(worker_id),
+            "results_dir": os.path.join(self.workers_dir, f"worker-{worker_id}"),
+            "results_mode": "keep",
+            "compact_results": "false",
+            "retries": str(self.retries),
+            "report_stream": self.stream_file,
+        }
+
+    def run(self):
+        """
+        Discovers the scenarios, runs the shards in parallel and merges the results.
+
+        :return: 0 when every worker passed, 1 otherwise
+        """
+        start = time.time()
+        scenarios = FeatureScanner(self.paths).discover(self.tags)
+        if self.rerun_failed:
+            scenarios = self.filter_failed(scenarios)
+        if self.changes is not None:
+            scenarios = self.filter_affected(scenarios)
+        if not scenarios:
+            logging.warning(f"No scenarios found for tags {self.tags}")
+            return 0
+
+        if self.preflight:
+            validator = PreflightValidator(self.platform, self.environment, index=self.selection_index())
+            if not validator.run([scenario.location for scenario in scenarios]):
+                return 1
+            if self.preflight_only:
+                return 0
+
+        shards = self.shard(scenarios)
+        print(f"Running {len(scenarios)} scenario(s) for tag {self.tags} on {len(shards)} worker(s)")
+        ResultsDirectory(self.results_dir).prepare(self.results_mode)
+        if os.path.exists(self.workers_dir):
+            shutil.rmtree(self.workers_dir)
+
+        worker_envs = [self.worker_env(worker_id) for worker_id in range(len(shards))]
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(run_worker, shard, env) for shard, env in zip(shards, worker_envs)]
+            aggregator = ReportAggregator(self.stream_file)
+            pending = futures
+            while pending:
+                _, pending = wait(pending, timeout=self.live_interval or None)
+                if self.live_interval and aggregator.poll():
+                    print(aggregator.live_line())
+            exit_codes = [future.result() for future in futures]
+
+        report = self.merge_results([env["results_dir"] for env in worker_envs])
+        report.print_report()
+        self.check_results(scenarios)
+        aggregator.poll()
+        aggregator.print_summary()
+        aggregator.save(ResultsDirectory(self.results_dir).report_path("summary"))
+        results = ResultsDirectory(self.results_dir).read_scenario_results()
+        self.history.record(results)
+        self.write_rerun_manifest(results)
+        self.record_profile()
+        if self.compact:
+            ResultsDirectory(self.results_dir).compact()
+        print(f"Finished in {time.time() - start:.1f}s")
+        return 0 if not any(exit_codes) else 1
+
+    def record_profile(self):
+        """
+        Records the start-up and step latency of the run for its performance profile, from the metrics
+        files of all workers, and compares it with the latest run of the other profiles.
+        """
+        reports_dir = ResultsDirectory(self.results_dir).subdir(ResultsDirectory.REPORTS_DIR)
+        for name in sorted(os.listdir(reports_dir)):
+            if name.startswith("metrics") and name.endswith(".json"):
+                Metrics.load_json(os.path.join(reports_dir, name))
+        platform = self.platform.lstrip("@")
+        profile_history = ProfileHistory()
+        profile_history.record(ConfigRegistry.profile_label(), platform, self.environment)
+        profile_history.print_comparison(platform)
+
+    def read_rerun_manifest(self):
+        """Returns the scenario locations listed in the rerun manifest (empty when there is none)."""
+        if not os.path.exists(self.rerun_file):
+            return []
+        with open(self.rerun_file, 'r') as file:
+            return [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+    def filter_failed(self, scenarios):
+        """Keeps the scenarios listed in the rerun manifest."""
+        failed = set(self.read_rerun_manifest())
+        selected = [scenario for scenario in scenarios if scenario.location in failed]
+        print(f"Rerunning {len(selected)} failed scenario(s) from {self.rerun_file}")
+        return selected
+
+    def filter_affected(self, scenarios):
+        """Keeps the scenarios affected by the changes, according to the selection index."""
+        affected = set(self.selection_index().affected(self.changes))
+        selected = [scenario for scenario in scenarios if scenario.location in affected]
+        print(f"Selected {len(selected)} of {len(scenarios)} scenario(s) affected by {len(self.changes)} change(s)")
+        return selected
+
+    def write_rerun_manifest(self, results):
+        """
+        Writes the 'file:line' locations of the scenarios whose last attempt failed.
+        The file can also be passed to behave directly: behave @rerun-<platform>.txt
+
+        :param results: Scenario result dicts read from the results directory
+        :return: List of failed locations
+        """
+        last_attempts = {}
+        for result in results:
+            location = result.get("location")
+            if result.get("attempt", 1) >= last_attempts.get(location, {}).get("attempt", 1):
+                last_attempts[location] = result
+        failed = sorted(location for location, result in last_attempts.items() if result.get("status") == "failed")
+        with open(self.rerun_file, 'w') as file:
+            file.writelines(f"{location}\n" for location in failed)
+        if failed:
+            print(f"{len(failed)} failed scenario(s) written to {self.rerun_file}, rerun them with --rerun-failed")
+        return failed
+
+    def check_results(self, scenarios):
+        """
+        Checks that the merged Allure results hold exactly one result per scheduled scenario
+        (retries of a scenario share its history id and count once).
+
+        :param scenarios: The scheduled scenarios
+        :return: True when the results match the schedule
+        """
+        results_per_scenario = {}
+        skipped = 0
+        for name in os.listdir(self.results_dir):
+            if not name.endswith("-result.json"):
+                continue
+            with open(os.path.join(self.results_dir, name), 'r') as file:
+                result = json.load(file)
+            if result.get("status") == "skipped":
+                skipped += 1
+            history_id = result.get("historyId")
+            results_per_scenario[history_id] = results_per_scenario.get(history_id, 0) + 1
+        duplicated = sum(1 for count in results_per_scenario.values() if count > 1 + self.retries)
+        if skipped or duplicated or len(results_per_scenario) != len(scenarios):
+            logging.error(f"Merged Allure results do not match the schedule: {len(results_per_scenario)} scenario(s) "
+                          f"with results for {len(scenarios)} scheduled, {duplicated} duplicated, {skipped} skipped")
+            return False
+        return True
+
+    def merge_results(self, worker_dirs):
+        """
+        Moves every worker's Allure files into the shared results directory and merges their TestReport counts.
+
+        :param worker_dirs: Results directories of the workers
+        :return: The merged TestReport
+        """
+        os.makedirs(self.results_dir, exist_ok=True)
+        report = TestReport()
+        for worker_dir in worker_dirs:
+            if not os.path.isdir(worker_dir):
+                continue
+            for name in os.listdir(worker_dir):
+                path = os.path.join(worker_dir, name)
+                if name == REPORT_FILE:
+                    report.merge(TestReport.load(path))
+                elif os.path.isdir(path):
+                    # Sub-directories (e.g. per-scenario results) are merged into the same sub-directory
+                    target_dir = os.path.join(self.results_dir, name)
+                    os.makedirs(target_dir, exist_ok=True)
+                    for file_name in os.listdir(path):
+                        shutil.move(os.path.join(path, file_name), os.path.join(target_dir, file_name))
+                elif name != LOG_FILE:
+                    shutil.move(path, os.path.join(self.results_dir, name))
+        logging.info(f"Merged results of {len(worker_dirs)} worker(s) into {self.results_dir}")
+        return report
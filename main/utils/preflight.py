@@ -0,0 +1,158 @@
+import csv
+import glob
+import logging
+import os
+import time
+from main.utils.config_registry import ConfigRegistry
+from main.utils.locator_retrievel.locator_registry import LocatorRegistry
+from main.utils.locator_retrievel.locator_utility import LocatorUtil
+from main.utils.selection_index import SelectionIndex
+
+
+class PreflightIssue:
+    def __init__(self, severity, source, message):
+        """
+        A problem found before the run.
+
+        :param severity: 'error' (blocks the run) or 'warning'
+        :param source: Where it was found (scenario location, CSV file or capability file)
+        :param message: What is wrong
+        """
+        self.severity = severity
+        self.source = source
+        self.message = message
+
+    def __str__(self):
+        return f"[{self.severity.upper()}] {self.source}: {self.message}"
+
+
+class PreflightValidator:
+    """
+    Dry-run checks that need no device session: every step of the selected scenarios has a definition,
+    every (page, locator) they use exists in the page's CSV with a valid 'strategy=value' for the target
+    platform, and capabilities (and LambdaTest credentials for virtual Android) exist for the target environment.
+    """
+
+    def __init__(self, platform, environment, paths=None, index=None):
+        """
+        :param platform: The platform, with or without '@' (e.g. '@website' or 'website')
+        :param environment: The environment ('local' or 'virtual')
+        :param paths: Feature files or directories (default: features/feature_files)
+        :param index: An already built SelectionIndex to reuse
+        """
+        self.platform = platform.lstrip('@')
+        self.environment = environment
+        self.index = index or SelectionIndex(paths).build()
+        self.issues = []
+
+    def error(self, source, message):
+        self.issues.append(PreflightIssue("error", source, message))
+
+    def warning(self, source, message):
+        self.issues.append(PreflightIssue("warning", source, message))
+
+    def validate(self, locations=None):
+        """
+        Runs every check.
+
+        :param locations: 'file:line' locations of the selected scenarios (default: every indexed scenario)
+        :return: List of PreflightIssue
+        """
+        self.issues = []
+        scenarios = self.index.scenarios()
+        if locations is not None:
+            selected = set(locations)
+            scenarios = [scenario for scenario in scenarios if scenario["location"] in selected]
+
+        self.check_capabilities()
+        used_pages = set()
+        for scenario in scenarios:
+            for step in scenario.get("undefined", []):
+                self.error(scenario["location"], f"Undefined step: {step}")
+            for pair in scenario["locators"]:
+                page, locator = pair.split(".", 1)
+                used_pages.add(page)
+                self.check_locator(scenario["location"], page, locator)
+            used_pages.update(scenario["pages"])
+        self.check_locator_files(used_pages)
+        return self.issues
+
+    def check_capabilities(self):
+        source = os.path.join(ConfigRegistry.CAPABILITIES_DIR, f"{self.platform}.json")
+        try:
+            ConfigRegistry.get_capabilities(self.platform, self.environment)
+        except ValueError as e:
+            self.error(source, str(e))
+            return
+        # Only virtual Android sessions are started on LambdaTest
+        if self.platform == "android" and self.environment == "virtual" and not all(ConfigRegistry.get_credentials()):
+            self.error(
+                os.path.join(ConfigRegistry.CAPABILITIES_DIR, ConfigRegistry.CREDENTIALS_FILE),
+                "LambdaTest credentials missing, set LT_USERNAME and LT_ACCESS_KEY"
+            )
+
+    def check_locator(self, source, page, locator):
+        try:
+            locators = LocatorRegistry.get_page(page)
+        except FileNotFoundError as e:
+            self.error(source, str(e))
+            return
+        if locator not in locators:
+            self.error(source, f"Locator '{locator}' not found in {page}.csv")
+        elif locators[locator].get(self.platform) is None:
+            self.error(source, f"Locator '{locator}' in {page}.csv has no valid 'strategy=value' for {self.platform}")
+        else:
+            chain = locators[locator].get("chains", {}).get(self.platform) or [locators[locator][self.platform]]
+            for locator_type, _ in chain:
+                if locator_type not in LocatorUtil.LOCATOR_TYPES:
+                    self.error(source, f"Locator '{locator}' in {page}.csv uses unsupported strategy '{locator_type}'")
+                elif locator_type == "accessibility_id" and self.platform == "website":
+                    # Browsers have no accessibility id lookup, the alternative can never resolve
+                    self.warning(source, f"Locator '{locator}' in {page}.csv uses 'accessibility_id', which only works on mobile")
+
+    def check_locator_files(self, used_pages):
+        """
+        Lints every locator CSV. Problems in pages used by the selected scenarios are errors, others warnings.
+        """
+        for file_path in sorted(glob.glob(os.path.join(LocatorRegistry.LOCATORS_DIR, "*.csv"))):
+            page = os.path.splitext(os.path.basename(file_path))[0]
+            report = self.error if page in used_pages else self.warning
+            try:
+                with open(file_path, mode='r', newline='') as file:
+                    rows = list(csv.reader(file, strict=True))
+            except csv.Error as e:
+                report(file_path, f"Malformed CSV: {e}")
+                continue
+            if not rows or len(rows[0]) < len(LocatorRegistry.PLATFORM_COLUMNS) + 1:
+                report(file_path, "Missing or incomplete header (locator, android, ios, website, timeout)")
+                continue
+            index = dict(LocatorRegistry.PLATFORM_COLUMNS).get(self.platform)
+            for line, row in enumerate(rows[1:], start=2):
+                if not row or not row[0].strip():
+                    continue
+                if len(row) <= len(LocatorRegistry.PLATFORM_COLUMNS) or any("\n" in value for value in row):
+                    report(f"{file_path}:{line}", f"'{row[0].strip()}' has {len(row)} column(s) or an unterminated quote")
+                    continue
+                cell = row[index].strip() if index is not None and len(row) > index else ''
+                for part in LocatorRegistry.split_alternatives(cell):
+                    if LocatorRegistry.parse_locator(part) is None:
+                        self.warning(f"{file_path}:{line}", f"'{row[0].strip()}' has a malformed {self.platform} locator: {part}")
+
+    def run(self, locations=None):
+        """
+        Validates and prints the issues.
+
+        :return: True when no errors were found
+        """
+        start = time.perf_counter()
+        issues = self.validate(locations)
+        errors = [issue for issue in issues if issue.severity == "error"]
+        for issue in issues:
+            print(issue)
+        print(
+            f"Preflight: {len(errors)} error(s), {len(issues) - len(errors)} warning(s) "
+            f"in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+        if errors:
+            logging.error("Preflight failed, no device session was opened")
+        return not errors
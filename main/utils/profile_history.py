@@ -0,0 +1,82 @@
+import json
+import logging
+import os
+import time
+from main.utils.metrics import Metrics
+
+
+class ProfileHistory:
+    """
+    Local store (JSON lines) of the session start-up and step latency of every run, per performance
+    profile and platform, so profiles (e.g. 'default' vs 'fast') can be compared across runs.
+    """
+
+    DEFAULT_FILE = ".profile_history.jsonl"
+
+    def __init__(self, file_path=None):
+        """
+        :param file_path: The history file (default: the 'profile_history_file' env var or .profile_history.jsonl)
+        """
+        self.file_path = file_path or os.environ.get("profile_history_file", self.DEFAULT_FILE)
+
+    def records(self):
+        """Returns the stored records, oldest first."""
+        records = []
+        if os.path.exists(self.file_path):
+            with open(self.file_path, 'r') as file:
+                for line in file:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logging.warning(f"Skipping malformed line in {self.file_path}")
+        return records
+
+    def record(self, profile, platform, environment):
+        """
+        Appends the start-up and step latency of this run (from Metrics) for a profile.
+
+        :param profile: The profile label (e.g. 'fast', 'headless+eager', 'default')
+        :param platform: The platform ('website', 'android', 'ios')
+        :param environment: The environment ('local', 'virtual')
+        :return: The record, or None when no step ran
+        """
+        steps = Metrics.merged(Metrics.STEP_DURATION, platform=platform, profile=profile)
+        if not steps["count"]:
+            return None
+        startup = Metrics.merged(Metrics.SESSION_STARTUP, platform=platform, profile=profile)
+        record = {
+            "profile": profile,
+            "platform": platform,
+            "environment": environment,
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sessions": startup["count"],
+            "startup_mean": startup["mean"],
+            "startup_max": startup["max"],
+            "steps": steps["count"],
+            "step_mean": steps["mean"],
+            "step_p50": steps["p50"],
+            "step_p95": steps["p95"],
+        }
+        os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+        with open(self.file_path, 'a') as file:
+            file.write(json.dumps(record) + "\n")
+        return record
+
+    def latest(self, platform):
+        """Returns the most recent record of every profile run on the platform."""
+        latest = {}
+        for record in self.records():
+            if record.get("platform") == platform:
+                latest[record["profile"]] = record
+        return latest
+
+    def print_comparison(self, platform):
+        latest = self.latest(platform)
+        if not latest:
+            return
+        print(f"\nPerformance profiles ({platform}, latest run of each):")
+        for profile, record in sorted(latest.items(), key=lambda item: item[1]["step_mean"]):
+            print(
+                f"start-up {record['startup_mean']:.2f}s ({record['sessions']} session(s)), "
+                f"step mean {record['step_mean']:.3f}s, p95 {record['step_p95']:.2f}s - {profile}"
+            )
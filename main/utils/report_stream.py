@@ -0,0 +1,143 @@
+import json
+import math
+import os
+import threading
+
+STREAM_FILE = "scenario_stream.jsonl"
+
+
+class ReportStream:
+    """
+    Append-only JSON lines file that every worker writes its scenario results to as they finish.
+    Each result is a single write() to a file opened in append mode, so lines from parallel
+    processes never interleave.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, file_path):
+        """
+        :param file_path: The shared stream file
+        """
+        self.file_path = file_path
+
+    def append(self, result):
+        """
+        Appends one scenario result.
+
+        :param result: Scenario result dict (name, feature, location, status, duration, tags, platform, ...)
+        """
+        line = (json.dumps(result) + "\n").encode("utf-8")
+        os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+        with self._lock:
+            fd = os.open(self.file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+
+class ReportAggregator:
+    """
+    Reads a ReportStream incrementally and keeps pass/fail/skip counts and durations by tag, feature
+    and platform. Only the last attempt of a retried scenario counts.
+    """
+
+    PERCENTILES = (50, 90, 95)
+
+    def __init__(self, file_path):
+        """
+        :param file_path: The stream file to follow
+        """
+        self.file_path = file_path
+        self._offset = 0
+        self._partial = b""
+        self.latest = {}  # (platform, location) -> result of the last attempt
+
+    def poll(self):
+        """
+        Reads the results appended since the last call.
+
+        :return: Number of new results
+        """
+        if not os.path.exists(self.file_path):
+            return 0
+        with open(self.file_path, 'rb') as file:
+            file.seek(self._offset)
+            data = file.read()
+        self._offset += len(data)
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()  # A line still being written has no newline yet
+        count = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            key = (result.get("platform"), result.get("location"))
+            previous = self.latest.get(key)
+            if previous is None or result.get("attempt", 1) >= previous.get("attempt", 1):
+                self.latest[key] = result
+            count += 1
+        return count
+
+    @classmethod
+    def percentile(cls, sorted_values, percent):
+        """Nearest-rank percentile of an already sorted list."""
+        if not sorted_values:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    @classmethod
+    def group_stats(cls, results):
+        counts = {"total": len(results), "passed": 0, "failed": 0, "skipped": 0}
+        for result in results:
+            if result.get("status") in counts:
+                counts[result["status"]] += 1
+        durations = sorted(result["duration"] for result in results if result.get("duration") is not None)
+        counts.update({f"p{percent}": round(cls.percentile(durations, percent), 3) for percent in cls.PERCENTILES})
+        counts["max"] = round(durations[-1], 3) if durations else 0.0
+        return counts
+
+    def summary(self):
+        """
+        Returns the overall statistics and the statistics grouped by tag, feature and platform.
+        """
+        results = list(self.latest.values())
+        groups = {"tag": {}, "feature": {}, "platform": {}}
+        for result in results:
+            for tag in result.get("tags", []):
+                groups["tag"].setdefault(tag, []).append(result)
+            groups["feature"].setdefault(result.get("feature"), []).append(result)
+            groups["platform"].setdefault(result.get("platform"), []).append(result)
+        return {
+            "overall": self.group_stats(results),
+            **{
+                f"by_{name}": {str(key): self.group_stats(values) for key, values in sorted(group.items(), key=lambda item: str(item[0]))}
+                for name, group in groups.items()
+            },
+        }
+
+    def live_line(self):
+        """One-line progress summary for long runs."""
+        overall = self.group_stats(list(self.latest.values()))
+        return (
+            f"[live] {overall['total']} scenario(s) done: {overall['passed']} passed, {overall['failed']} failed, "
+            f"{overall['skipped']} skipped, p95 {overall['p95']:.1f}s"
+        )
+
+    def print_summary(self):
+        summary = self.summary()
+        print("\nResults by feature:")
+        for feature, stats in summary["by_feature"].items():
+            print(
+                f"{stats['passed']}/{stats['total']} passed, {stats['failed']} failed, {stats['skipped']} skipped, "
+                f"p50 {stats['p50']:.1f}s, p95 {stats['p95']:.1f}s - {feature}"
+            )
+        print("Results by tag:")
+        for tag, stats in summary["by_tag"].items():
+            print(f"{stats['passed']}/{stats['total']} passed, {stats['failed']} failed, {stats['skipped']} skipped - @{tag}")
+
+    def save(self, file_path):
+        with open(file_path, 'w') as file:
+            json.dump(self.summary(), file, indent=2)
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+import zipfile
+
+
+class ResultsDirectory:
+    """
+    Owns the results directory of a run: it is cleared or rotated once when the run starts,
+    every scenario writes its own uniquely named result file as soon as it finishes, and the
+    small JSON files can optionally be packed into one indexed archive at the end.
+    """
+
+    SCENARIOS_DIR = "scenarios"
+    REPORTS_DIR = "reports"
+    ARCHIVE_NAME = "results.zip"
+    INDEX_NAME = "index.json"
+    MODES = ("clear", "rotate", "keep")
+
+    def __init__(self, path, worker_id=None):
+        """
+        :param path: The results directory (e.g. 'allure-results-@android')
+        :param worker_id: Id of the parallel worker writing to it, keeps report file names unique after merging
+        """
+        self.path = path
+        self.worker_id = worker_id
+
+    def prepare(self, mode="clear"):
+        """
+        Prepares the directory once per run.
+
+        :param mode: 'clear' deletes previous results, 'rotate' renames them to '<path>-<timestamp>',
+                     'keep' leaves them in place (used by parallel workers whose runner owns the directory)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid results mode '{mode}'. Must be one of: {', '.join(self.MODES)}")
+        if os.path.exists(self.path) and mode == "clear":
+            shutil.rmtree(self.path)
+            logging.info(f"Deleted existing {self.path} folder")
+        elif os.path.exists(self.path) and mode == "rotate":
+            rotated = f"{self.path}-{time.strftime('%Y%m%d-%H%M%S')}"
+            os.rename(self.path, rotated)
+            logging.info(f"Rotated existing {self.path} folder to {rotated}")
+        os.makedirs(self.subdir(self.SCENARIOS_DIR), exist_ok=True)
+
+    def subdir(self, name):
+        """Returns the path of a sub-directory of the results directory, creating it if needed."""
+        path = os.path.join(self.path, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def report_path(self, name, extension="json"):
+        """
+        Returns the path of a run report (e.g. metrics) in the reports sub-directory.
+        Parallel workers get their worker id appended so merged reports do not overwrite each other.
+        """
+        file_name = f"{name}-worker{self.worker_id}.{extension}" if self.worker_id else f"{name}.{extension}"
+        return os.path.join(self.subdir(self.REPORTS_DIR), file_name)
+
+    @staticmethod
+    def scenario_result(scenario, **extra):
+        """
+        Returns the result of one finished scenario as a dictionary.
+
+        :param scenario: The behave Scenario
+        :param extra: Additional fields to store (e.g. platform, worker_id)
+        """
+        result = {
+            "name": scenario.name,
+            "feature": scenario.feature.name,
+            "location": str(scenario.location),
+            "status": getattr(scenario.status, "name", str(scenario.status)),
+            "duration": scenario.duration,
+            "tags": sorted(str(tag) for tag in scenario.effective_tags),
+            "finished_at": time.time(),
+        }
+        result.update(extra)
+        return result
+
+    def write_scenario_result(self, result):
+        """
+        Writes the result of one finished scenario to its own file.
+        The file is written under a temporary name and renamed, so readers never see partial JSON.
+
+        :param result: The scenario result, see scenario_result()
+        :return: Path of the written file
+        """
+        file_path = os.path.join(self.subdir(self.SCENARIOS_DIR), f"{uuid.uuid4()}-scenario.json")
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, 'w') as file:
+            json.dump(result, file)
+        os.replace(temp_path, file_path)
+        return file_path
+
+    def read_scenario_results(self):
+        """Returns every scenario result written to this directory."""
+        results = []
+        scenarios_dir = os.path.join(self.path, self.SCENARIOS_DIR)
+        if os.path.isdir(scenarios_dir):
+            for name in sorted(os.listdir(scenarios_dir)):
+                if name.endswith("-scenario.json"):
+                    with open(os.path.join(scenarios_dir, name), 'r') as file:
+                        results.append(json.load(file))
+        return results
+
+    def compact(self, remove=True):
+        """
+        Packs every JSON file of the results directory into a single zip archive with an index,
+        so uploading thousands of small files becomes one transfer.
+
+        :param remove: Delete the packed files after they were archived
+        :return: Path of the archive
+        """
+        archive_path = os.path.join(self.path, self.ARCHIVE_NAME)
+        index = {}
+        packed = []
+        with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for root, _, files in os.walk(self.path):
+                for name in sorted(files):
+                    if not name.endswith(".json"):
+                        continue
+                    file_path = os.path.join(root, name)
+                    arcname = os.path.relpath(file_path, self.path)
+                    archive.write(file_path, arcname)
+                    index[arcname] = os.path.getsize(file_path)
+                    packed.append(file_path)
+            archive.writestr(self.INDEX_NAME, json.dumps({"files": index}, indent=2))
+
+        if remove:
+            for file_path in packed:
+                os.remove(file_path)
+        logging.info(f"Compacted {len(packed)} result file(s) into {archive_path}")
+        return archive_path
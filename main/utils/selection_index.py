@@ -0,0 +1,182 @@
+import glob
+import json
+import logging
+import os
+import subprocess
+from behave.parser import parse_file
+from behave.runner_util import load_step_modules
+from behave.step_registry import registry
+from main.utils.feature_scanner import FeatureScanner
+
+LOCATOR_ARGUMENTS = ("locator", "frame_locator")
+
+
+class SelectionIndex:
+    """
+    Static index of which scenarios use which (page, locator) pairs, step texts and step definition files,
+    built by matching every step of the feature files against the registered step definitions.
+    It is cached per feature file and only re-parsed for files whose modification time changed.
+    """
+
+    DEFAULT_CACHE = ".selection_index.json"
+    VERSION = 2  # Bumped when the entry format changes, so older caches are rebuilt
+    LOCATORS_DIR = os.path.join("main", "locators")
+    STEPS_DIR = os.path.join("features", "steps")
+
+    def __init__(self, paths=None, cache_file=None):
+        """
+        :param paths: Feature files or directories to index (default: features/feature_files)
+        :param cache_file: The index cache (default: .selection_index.json)
+        """
+        self.scanner = FeatureScanner(paths)
+        self.cache_file = cache_file or self.DEFAULT_CACHE
+        self.features = {}  # feature file -> {"mtime", "scenarios"}
+
+    def steps_signature(self):
+        """Modification times of the step definition files; the whole index is rebuilt when they change."""
+        return {path: os.path.getmtime(path) for path in sorted(glob.glob(os.path.join(self.STEPS_DIR, "*.py")))}
+
+    def build(self):
+        """
+        Loads the cached index and re-indexes the feature files that were added or changed since.
+
+        :return: self
+        """
+        cache = {}
+        if os.path.exists(self.cache_file):
+            with open(self.cache_file, 'r') as file:
+                cache = json.load(file)
+        signature = self.steps_signature()
+        up_to_date = cache.get("version") == self.VERSION and cache.get("steps") == signature
+        cached_features = cache.get("features", {}) if up_to_date else {}
+
+        changed = 0
+        self.features = {}
+        for path in self.scanner.feature_files():
+            mtime = os.path.getmtime(path)
+            entry = cached_features.get(path)
+            if entry is None or entry["mtime"] != mtime:
+                entry = {"mtime": mtime, "scenarios": self.index_feature(path)}
+                changed += 1
+            self.features[path] = entry
+
+        if changed or set(cached_features) != set(self.features):
+            with open(self.cache_file, 'w') as file:
+                json.dump({"version": self.VERSION, "steps": signature, "features": self.features}, file, indent=2)
+        logging.info(f"Selection index: {len(self.features)} feature file(s), {changed} re-indexed")
+        return self
+
+    @staticmethod
+    def load_step_definitions():
+        # The step modules register themselves once per process
+        if not any(registry.steps.values()):
+            load_step_modules([SelectionIndex.STEPS_DIR])
+
+    def index_feature(self, path):
+        """
+        Returns the index entries of every scenario of a feature file: its location, step texts,
+        (page, locator) pairs, pages, step definition files and undefined steps.
+        """
+        self.load_step_definitions()
+        feature = parse_file(path)
+        if not feature:
+            return []
+        entries = []
+        for scenario in feature.scenarios:
+            steps, pairs, pages, step_files, undefined = set(), set(), set(), set(), set()
+            # Scenario outlines are indexed through their examples, so placeholders are filled in
+            for example in getattr(scenario, "scenarios", None) or [scenario]:
+                for step in example.all_steps:
+                    steps.add(step.name)
+                    match = registry.find_match(step)
+                    if match is None:
+                        undefined.add(f"{step.keyword} {step.name}")
+                        continue
+                    step_files.add(os.path.normpath(match.location.filename))
+                    arguments = {argument.name: str(argument.value).strip('"') for argument in match.arguments if argument.name}
+                    page = arguments.get("page_name")
+                    if page:
+                        pages.add(page)
+                        pairs.update(f"{page}.{arguments[name]}" for name in LOCATOR_ARGUMENTS if name in arguments)
+            entries.append({
+                "location": str(scenario.location),
+                "name": scenario.name,
+                "steps": sorted(steps),
+                "locators": sorted(pairs),
+                "pages": sorted(pages),
+                "step_files": sorted(step_files),
+                "undefined": sorted(undefined),
+            })
+        return entries
+
+    def scenarios(self):
+        return [scenario for entry in self.features.values() for scenario in entry["scenarios"]]
+
+    def affected(self, changes):
+        """
+        Returns the locations of the scenarios affected by a list of changes.
+
+        :param changes: Changed files (feature files, locator CSVs, step files) or locator rows written as
+                        'page.locator' / 'page.csv:locator'. Any other changed file selects every scenario.
+        :return: Sorted list of 'file:line' locations
+        """
+        selected = set()
+        for change in changes:
+            change = change.strip()
+            if not change:
+                continue
+            path = os.path.normpath(change)
+            if change.endswith(".feature"):
+                selected.update(scenario["location"] for scenario in self.features.get(path, {}).get("scenarios", []))
+            elif change.endswith(".csv") and os.path.dirname(path) == self.LOCATORS_DIR:
+                page = os.path.splitext(os.path.basename(path))[0]
+                selected.update(scenario["location"] for scenario in self.scenarios() if page in scenario["pages"])
+            elif change.endswith(".py") and os.path.dirname(path) == self.STEPS_DIR:
+                selected.update(scenario["location"] for scenario in self.scenarios() if path in scenario["step_files"])
+            elif self.is_locator_row(change):
+                pair = change.replace(".csv:", ".")
+                selected.update(scenario["location"] for scenario in self.scenarios() if pair in scenario["locators"])
+            else:
+                logging.info(f"{change} is not covered by the selection index, selecting every scenario")
+                return sorted(scenario["location"] for scenario in self.scenarios())
+        return sorted(selected)
+
+    def is_locator_row(self, change):
+        """True for 'page.locator' or 'page.csv:locator' where the page has a locator CSV or is used by a scenario."""
+        if "/" in change or os.sep in change or "." not in change:
+            return False
+        page = change.split(".", 1)[0]
+        used_pages = {used for scenario in self.scenarios() for used in scenario["pages"]}
+        return page in used_pages or os.path.exists(os.path.join(self.LOCATORS_DIR, f"{page}.csv"))
+
+    @classmethod
+    def changes_since(cls, ref):
+        """
+        Lists the changes between a git ref and the working tree. Locator CSVs are reported per changed
+        row ('page.locator'), so editing one locator only selects the scenarios that use it.
+
+        :param ref: Git ref to compare with (e.g. 'origin/main' or 'HEAD~1')
+        :return: List of changes accepted by affected()
+        """
+        files = subprocess.run(
+            ["git", "diff", "--name-only", ref], capture_output=True, text=True, check=True
+        ).stdout.split()
+        changes = []
+        for path in files:
+            if not (path.endswith(".csv") and os.path.dirname(os.path.normpath(path)) == cls.LOCATORS_DIR):
+                changes.append(path)
+                continue
+            diff = subprocess.run(
+                ["git", "diff", "--unified=0", ref, "--", path], capture_output=True, text=True, check=True
+            ).stdout
+            rows = [
+                line[1:] for line in diff.splitlines()
+                if line[:1] in "+-" and not line.startswith(("+++", "---"))
+            ]
+            if not rows or any(row.split(',', 1)[0].strip() == "locator" for row in rows):
+                # A header change (or a deleted/renamed file) can affect every locator of the page
+                changes.append(path)
+                continue
+            page = os.path.splitext(os.path.basename(path))[0]
+            changes.extend(sorted({f"{page}.{row.split(',', 1)[0].strip()}" for row in rows if row.strip()}))
+        return changes
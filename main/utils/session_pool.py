@@ -0,0 +1,251 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SessionPool:
+    """
+    Keeps WebDriver/Appium sessions alive between scenarios so each scenario does not pay for a
+    cold session start. Sessions are keyed by platform, environment and capabilities; a session
+    is only handed out again to a scenario with the same key, after it has been health-checked
+    and reset.
+
+    Optionally, spare sessions are pre-warmed in the background while a scenario runs, so a scenario
+    that cannot reuse a session (e.g. @fresh_session) gets a ready one instead of waiting for the
+    cloud queue and the app install. max_spare caps the idle plus pre-warming sessions, to stay
+    inside the cloud concurrency quota. A spare is health-checked before it is handed out, and quit
+    once it has waited longer than the session's 'idleTimeout' capability, after which the provider
+    has already ended it.
+    """
+
+    FRESH_SESSION_TAG = "fresh_session"  # Scenarios tagged @fresh_session always get a new session
+    VOLATILE_CAPABILITIES = ("name", "build")  # Per-scenario values that must not split the pool
+
+    def __init__(self, before_quit=None, max_spare=0):
+        """
+        :param before_quit: Callable run with a driver right before its session is quit (e.g. flushing status updates)
+        :param max_spare: Maximum number of idle plus pre-warming sessions; 0 disables pre-warming
+        """
+        self.before_quit = before_quit
+        self.max_spare = max(0, int(max_spare))
+        self._lock = threading.Lock()
+        self._idle = {}  # key -> list of idle drivers
+        self._in_use = {}  # id(driver) -> (key, platform, driver)
+        self._warming = {}  # key -> list of (future, idle timeout) of sessions being started in the background
+        self._executor = None
+        self.prewarm_hits = 0
+        self.prewarm_wait_seconds = 0.0
+
+    @classmethod
+    def make_key(cls, platform, environment, capabilities):
+        """
+        Builds the pool key for a session.
+
+        :param platform: The platform ('website', 'android', 'ios')
+        :param environment: The environment ('local', 'virtual')
+        :param capabilities: The capabilities the session was started with
+        :return: A hashable key
+        """
+        stable_capabilities = {
+            key: value for key, value in (capabilities or {}).items()
+            if key not in cls.VOLATILE_CAPABILITIES
+        }
+        return platform, environment, json.dumps(stable_capabilities, sort_keys=True, default=str)
+
+    def acquire(self, platform, environment, capabilities, factory, fresh=False):
+        """
+        Returns a live session for the given key, reusing an idle one when possible.
+
+        :param platform: The platform ('website', 'android', 'ios')
+        :param environment: The environment ('local', 'virtual')
+        :param capabilities: The capabilities of the requested session
+        :param factory: Callable that starts a new session when none can be reused
+        :param fresh: Skip reuse and always start a new session
+        :return: WebDriver instance
+        """
+        key = self.make_key(platform, environment, capabilities)
+        while not fresh:
+            with self._lock:
+                idle = self._idle.get(key)
+                driver = idle.pop() if idle else None
+            if driver is None:
+                break
+            if self.is_healthy(driver) and self.reset(driver, platform):
+                logging.info(f"Reusing pooled {platform} session {driver.session_id}")
+                self._mark_in_use(key, platform, driver)
+                return driver
+            self._quit(driver)
+
+        driver = self._take_prewarmed(key)
+        if driver is None:
+            logging.info(f"Starting new {platform} session")
+            driver = factory()
+        self._mark_in_use(key, platform, driver)
+        return driver
+
+    def prewarm(self, platform, environment, capabilities, factory):
+        """
+        Starts a spare session in the background for the next scenario, unless max_spare sessions
+        are already idle or pre-warming.
+
+        :param factory: Callable that starts the session; it must not share state with the running scenario
+        :return: True when a session is being pre-warmed
+        """
+        if not self.max_spare:
+            return False
+        key = self.make_key(platform, environment, capabilities)
+        with self._lock:
+            spare = sum(len(idle) for idle in self._idle.values()) + sum(len(warming) for warming in self._warming.values())
+            if spare >= self.max_spare:
+                return False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_spare, thread_name_prefix="session-prewarm")
+            idle_timeout = (capabilities or {}).get("idleTimeout")
+            self._warming.setdefault(key, []).append((self._executor.submit(self._start_spare, factory), idle_timeout))
+        logging.info(f"Pre-warming a spare {platform} session ({spare + 1}/{self.max_spare})")
+        return True
+
+    @staticmethod
+    def _start_spare(factory):
+        """Starts a spare session; returns it with the time it became ready."""
+        driver = factory()
+        return driver, time.monotonic()
+
+    def _take_prewarmed(self, key):
+        """
+        Returns a healthy pre-warmed session for the key, waiting for it if it is still starting, or None.
+        Spares that idled past their idle timeout or no longer answer are quit and skipped.
+        """
+        while True:
+            with self._lock:
+                warming = self._warming.get(key)
+                future, idle_timeout = warming.pop(0) if warming else (None, None)
+            if future is None:
+                return None
+            ready = future.done()
+            start = time.perf_counter()
+            try:
+                driver, ready_at = future.result()
+            except Exception as e:
+                logging.warning(f"Pre-warmed session failed to start: {e}")
+                continue
+            waited = time.perf_counter() - start
+            idle_seconds = time.monotonic() - ready_at
+            if idle_timeout and idle_seconds > float(idle_timeout):
+                logging.info(
+                    f"Pre-warmed session {driver.session_id} idled {idle_seconds:.0f}s, "
+                    f"past its idle timeout of {idle_timeout}s, starting another one"
+                )
+                self._quit(driver)
+                continue
+            if not self.is_healthy(driver):
+                self._quit(driver)
+                continue
+            self.prewarm_hits += 1
+            self.prewarm_wait_seconds += waited
+            logging.info(
+                f"Using pre-warmed session {driver.session_id}"
+                + (" (ready)" if ready else f" (waited {waited:.1f}s for it to finish starting)")
+            )
+            return driver
+
+    def release(self, driver, reusable=True):
+        """
+        Hands a session back to the pool once a scenario is done with it.
+
+        :param driver: The WebDriver instance returned by acquire
+        :param reusable: When False the session is quit instead of being kept for the next scenario
+        """
+        with self._lock:
+            entry = self._in_use.pop(id(driver), None)
+            if entry and reusable and self.can_reset(driver, entry[1]):
+                self._idle.setdefault(entry[0], []).append(driver)
+                return
+        self._quit(driver)
+
+    def quit_all(self):
+        """Quits every session the pool knows about, idle or in use."""
+        with self._lock:
+            drivers = [driver for idle in self._idle.values() for driver in idle]
+            drivers += [entry[2] for entry in self._in_use.values()]
+            self._idle.clear()
+            self._in_use.clear()
+            warming = [future for futures in self._warming.values() for future, _ in futures]
+            self._warming.clear()
+            executor, self._executor = self._executor, None
+        # Sessions still starting are waited for, otherwise they would keep holding a cloud slot
+        for future in warming:
+            if not future.cancel():
+                try:
+                    drivers.append(future.result()[0])
+                except Exception as e:
+                    logging.warning(f"Pre-warmed session failed to start: {e}")
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for driver in drivers:
+            self._quit(driver)
+        logging.info(f"Session pool closed {len(drivers)} session(s)")
+        if self.prewarm_hits:
+            logging.info(
+                f"{self.prewarm_hits} scenario(s) used a pre-warmed session, "
+                f"waiting {self.prewarm_wait_seconds:.1f}s in total for them to be ready"
+            )
+
+    @staticmethod
+    def is_healthy(driver):
+        """
+        Checks that the remote session still answers commands.
+        """
+        try:
+            driver.get_window_size()
+            return True
+        except Exception as e:
+            logging.warning(f"Pooled session {getattr(driver, 'session_id', None)} is not healthy: {e}")
+            return False
+
+    @staticmethod
+    def can_reset(driver, platform):
+        """
+        Checks that a session can be brought back to a clean state. Mobile sessions need an Appium
+        driver (app reset); others are quit instead of being pooled.
+        """
+        if platform == "website" or callable(getattr(driver, "reset", None)):
+            return True
+        logging.info(f"{platform} session {getattr(driver, 'session_id', None)} has no app reset, not pooling it")
+        return False
+
+    @staticmethod
+    def reset(driver, platform):
+        """
+        Brings a session back to a clean state before it is reused.
+        Websites get their cookies and storage cleared, mobile apps are reset.
+
+        :return: True when the session was reset successfully
+        """
+        try:
+            if platform == "website":
+                driver.switch_to.default_content()
+                driver.delete_all_cookies()
+                driver.execute_script(
+                    "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+                )
+            else:
+                driver.reset()
+            return True
+        except Exception as e:
+            logging.warning(f"Failed to reset pooled {platform} session: {e}")
+            return False
+
+    def _mark_in_use(self, key, platform, driver):
+        with self._lock:
+            self._in_use[id(driver)] = (key, platform, driver)
+
+    def _quit(self, driver):
+        try:
+            if self.before_quit is not None:
+                self.before_quit(driver)
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Failed to quit session: {e}")
@@ -1,8 +1,18 @@
+import json
+
+REPORT_FILE = "test_report.json"
+
+
 class TestReport:
     def __init__(self):
         self.total_cases = 0
         self.passed_cases = 0
         self.failed_cases = 0
+        self.skipped_cases = 0
+        # Retries are counted apart from the first-attempt results above
+        self.retry_attempts = 0
+        self.passed_on_retry = 0
+        self.failed_after_retry = 0
 
     def update_report(self, result):
         self.total_cases += 1
@@ -10,19 +20,82 @@ class TestReport:
             self.passed_cases += 1
         elif result == "failed":
             self.failed_cases += 1
+        elif result == "skipped":
+            self.skipped_cases += 1
+
+    def add_pass(self):
+        self.update_report("passed")
+
+    def add_fail(self):
+        self.update_report("failed")
+
+    def add_skip(self):
+        self.update_report("skipped")
+
+    def add_retry(self, result, final):
+        """
+        Records the outcome of a retry attempt.
+
+        :param result: 'passed' or 'failed'
+        :param final: True when no further attempt follows
+        """
+        self.retry_attempts += 1
+        if result == "passed":
+            self.passed_on_retry += 1
+        elif result == "failed" and final:
+            self.failed_after_retry += 1
+
+    def merge(self, other):
+        """Adds the counts of another TestReport (e.g. from a parallel worker) to this one."""
+        self.total_cases += other.total_cases
+        self.passed_cases += other.passed_cases
+        self.failed_cases += other.failed_cases
+        self.skipped_cases += other.skipped_cases
+        self.retry_attempts += other.retry_attempts
+        self.passed_on_retry += other.passed_on_retry
+        self.failed_after_retry += other.failed_after_retry
 
     def generate_report(self):
         return {
             "total_cases": self.total_cases,
             "passed_cases": self.passed_cases,
             "failed_cases": self.failed_cases,
-            "pass_percentage": (self.passed_cases / self.total_cases) * 100 if self.total_cases > 0 else 0
+            "skipped_cases": self.skipped_cases,
+            "pass_percentage": (self.passed_cases / self.total_cases) * 100 if self.total_cases > 0 else 0,
+            "retry_attempts": self.retry_attempts,
+            "passed_on_retry": self.passed_on_retry,
+            "failed_after_retry": self.failed_after_retry,
         }
 
+    def save(self, file_path):
+        """Writes the report counts to a JSON file so another process can merge them."""
+        with open(file_path, 'w') as file:
+            json.dump(self.generate_report(), file, indent=2)
+
+    @classmethod
+    def load(cls, file_path):
+        """Reads a report previously written with save()."""
+        with open(file_path, 'r') as file:
+            data = json.load(file)
+        report = cls()
+        report.total_cases = data.get("total_cases", 0)
+        report.passed_cases = data.get("passed_cases", 0)
+        report.failed_cases = data.get("failed_cases", 0)
+        report.skipped_cases = data.get("skipped_cases", 0)
+        report.retry_attempts = data.get("retry_attempts", 0)
+        report.passed_on_retry = data.get("passed_on_retry", 0)
+        report.failed_after_retry = data.get("failed_after_retry", 0)
+        return report
+
     def print_report(self):
         report = self.generate_report()
         print("\nTest Report Summary:")
         print(f"Total Cases: {report['total_cases']}")
         print(f"Passed Cases: {report['passed_cases']}")
         print(f"Failed Cases: {report['failed_cases']}")
+        print(f"Skipped Cases: {report['skipped_cases']}")
         print(f"Pass Percentage: {report['pass_percentage']:.2f}%")
+        if report['retry_attempts']:
+            print(f"Retry Attempts: {report['retry_attempts']}")
+            print(f"Passed On Retry: {report['passed_on_retry']}")
+            print(f"Failed After Retry: {report['failed_after_retry']}")
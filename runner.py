@@ -0,0 +1,59 @@
+# runner.py
+import argparse
+import os
+import sys
+from main.utils.parallel_runner import ParallelRunner
+from main.utils.selection_index import SelectionIndex
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Run behave scenarios in parallel worker processes")
+    parser.add_argument("--platform", required=True, help="Platform tag: @android, @ios or @website")
+    parser.add_argument("--environment", default=os.environ.get("environment", ''), help="local or virtual")
+    parser.add_argument("--tags", help="Tag expression selecting scenarios (defaults to the platform tag)")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("workers", 1)),
+                        help="Number of worker processes, each with its own driver")
+    parser.add_argument("--results-mode", choices=["clear", "rotate"], default="clear",
+                        help="Clear or rotate the previous results directory once at the start of the run")
+    parser.add_argument("--compact", action="store_true",
+                        help="Pack the merged JSON results into one indexed archive for upload")
+    parser.add_argument("--history-file", default=None,
+                        help="Scenario duration history used to balance the workers (default: .scenario_durations.jsonl)")
+    parser.add_argument("--retries", type=int, default=int(os.environ.get("retries", 0)),
+                        help="Run a failed scenario again up to this many times within the run")
+    parser.add_argument("--rerun-failed", action="store_true",
+                        help="Only run the scenarios that failed in the previous run (see --rerun-file)")
+    parser.add_argument("--rerun-file", default=None,
+                        help="Rerun manifest of failed scenarios (default: rerun-<platform>.txt)")
+    parser.add_argument("--changed", action="append", default=None, metavar="CHANGE",
+                        help="Only run scenarios affected by this changed file or locator row (page.locator); repeatable")
+    parser.add_argument("--changed-since", metavar="REF",
+                        help="Only run scenarios affected by the changes between a git ref and the working tree")
+    parser.add_argument("--skip-preflight", action="store_true",
+                        help="Do not validate steps, locators and capabilities before opening sessions")
+    parser.add_argument("--preflight-only", action="store_true",
+                        help="Only run the preflight validation")
+    parser.add_argument("--live", type=float, default=0, metavar="SECONDS",
+                        help="Print a live pass/fail summary every SECONDS while the workers run")
+    parser.add_argument("paths", nargs="*", help="Feature files or directories (default: features/feature_files)")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    options = parse_args(args)
+    changes = options.changed
+    if options.changed_since:
+        changes = (changes or []) + SelectionIndex.changes_since(options.changed_since)
+    runner = ParallelRunner(
+        options.platform, options.environment, tags=options.tags,
+        workers=options.workers, paths=options.paths or None,
+        results_mode=options.results_mode, compact=options.compact, history_file=options.history_file,
+        retries=options.retries, rerun_failed=options.rerun_failed, rerun_file=options.rerun_file,
+        changes=changes, preflight=not options.skip_preflight, preflight_only=options.preflight_only,
+        live_interval=options.live
+    )
+    return runner.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
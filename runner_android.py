@@ -1,19 +1,15 @@
 import os
-from subprocess import run
+from main.utils.parallel_runner import ParallelRunner
 
 def run_tests(tag):
-    # Set the environment variable to pass the tag to the Behave environment
-    os.environ["platform"] = "@android"  # This will set the platform as Android
-    os.environ["environment"] = "virtual"  # This can be adjusted based on your environment needs
+    # The platform and environment are passed to the Behave environment by the runner
     feature_file = "features/feature_files/testing_app.feature"
 
-    # Update the command to specify the tag that filters Android-related tests
-    command = f"behave --tags={tag} {feature_file}"
+    # Run the scenarios matching the tag that filters Android-related tests
     print(f"Running tests for tag: {tag}")
-    
-    # Run the command
-    run(command, shell=True)
+    runner = ParallelRunner("@android", "virtual", tags=tag, workers=os.environ.get("workers", 1), paths=[feature_file])
+    return runner.run()
 
 if __name__ == "__main__":
     # Run tests for @android tag
-    run_tests("@android")
\ No newline at end of file
+    run_tests("@android")
@@ -1,16 +1,14 @@
 # runner.py
 import os
-from subprocess import run
+from main.utils.parallel_runner import ParallelRunner
 
 platform_runner = '@website'
 
 def run_tests(tag):
-    # Set the environment variable to pass the tag to the Behave environment
-    os.environ["platform"] = platform_runner
-
-    command = f"behave --tags={tag}"
+    # The platform is passed to the Behave environment by the runner
     print(f"Running tests for tag: {tag}")
-    run(command, shell=True)
+    runner = ParallelRunner(platform_runner, tags=tag, workers=os.environ.get("workers", 1))
+    return runner.run()
 
 if __name__ == "__main__":
     #Run tests for Website
@@ -0,0 +1,67 @@
+import os
+import unittest
+from unittest import mock
+from appium import webdriver as appium_webdriver
+from benchmarks.fake_webdriver_server import FakeWebDriverServer
+from main.utils.cloud_status_reporter import CloudStatusReporter
+from main.utils.lambda_basic_methods import LambdaBasicMethod
+from main.utils.session_pool import SessionPool
+
+CLOUD_ANDROID = {"platformName": "Android", "deviceName": "Pixel 8", "isRealMobile": True}
+
+
+class CloudStatusReporterTest(unittest.TestCase):
+    def setUp(self):
+        # The stub hub answers every command after a delay, so updates queue up behind each other
+        self.server = FakeWebDriverServer(latency=0.05).start()
+        self.reporter = CloudStatusReporter(retry_delay=0)
+        self.pool = SessionPool(before_quit=self.reporter.flush)
+        environ = mock.patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop("platform", None)
+        os.environ.pop("environment", None)
+
+    def tearDown(self):
+        self.pool.quit_all()
+        self.reporter.close()
+        self.server.stop()
+
+    def start_session(self, platform, environment):
+        lambda_method = LambdaBasicMethod(platform=platform, environment=environment, status_reporter=self.reporter)
+        driver = self.pool.acquire(
+            platform, environment, CLOUD_ANDROID,
+            lambda: appium_webdriver.Remote(self.server.url, desired_capabilities=CLOUD_ANDROID)
+        )
+        lambda_method.set_driver(driver)
+        return lambda_method, driver
+
+    def scripts(self):
+        return [body.get("script") for _, path, body in self.server.commands if path.endswith("/execute/sync")]
+
+    def test_updates_are_sent_in_order_and_flushed_before_quit(self):
+        lambda_method, driver = self.start_session("android", "virtual")
+        lambda_method.set_test_name("First")
+        lambda_method.update_test_status("failed")
+        lambda_method.set_test_name("Second")
+        lambda_method.update_test_status("passed")
+        self.pool.release(driver, reusable=False)
+
+        self.assertEqual(
+            self.scripts(),
+            ["lambda-name=First", "lambda-status=failed", "lambda-name=Second", "lambda-status=passed"]
+        )
+        self.assertEqual(self.server.commands[-1][:2], ("DELETE", f"/session/{driver.session_id}"))
+
+    def test_local_driver_sessions_get_no_updates(self):
+        lambda_method, driver = self.start_session("website", "virtual")
+        lambda_method.set_test_name("Website")
+        lambda_method.update_test_status("passed")
+        self.pool.release(driver, reusable=False)
+
+        self.assertEqual(self.scripts(), [])
+        self.assertEqual(self.reporter.sent + self.reporter.failed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+from benchmarks.fake_webdriver_server import FakeWebDriverServer
+from main.utils.command_replay import CommandRecorder, CommandReplayer
+
+CAPABILITIES = {"browserName": "chrome"}
+SCENARIO = "features/feature_files/landing_page.feature:User can open the website"
+LATENCY = 0.05
+
+
+def run_scenario(driver):
+    """The commands of a typical website scenario: open, wait for an element, read it and click it."""
+    driver.get("https://example.test/")
+    element = WebDriverWait(driver, 5).until(expected_conditions.visibility_of_element_located((By.ID, "continue")))
+    text = element.text
+    element.click()
+    return driver.title, text
+
+
+class CommandReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.recording = os.path.join(tempfile.mkdtemp(), "website.json.gz")
+        environ = mock.patch.dict(os.environ, {"record_commands": self.recording, "replay_commands": self.recording})
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop("worker_id", None)
+        CommandRecorder._sessions, CommandRecorder._scenarios, CommandRecorder._outside = {}, {}, {}
+        CommandReplayer._recording, CommandReplayer.divergences, CommandReplayer.replayed = None, [], 0
+
+    def record(self):
+        with FakeWebDriverServer(latency=LATENCY) as server:
+            driver = webdriver.Remote(server.url, desired_capabilities=CAPABILITIES)
+            CommandRecorder.install(driver, "website")
+            CommandRecorder.begin(SCENARIO)
+            result = run_scenario(driver)
+            CommandRecorder.end()
+            driver.quit()
+            commands = server.command_count()
+        CommandRecorder.save()
+        return result, commands
+
+    def replay(self):
+        driver = CommandReplayer.start_driver("website", CAPABILITIES)
+        CommandReplayer.begin(SCENARIO)
+        try:
+            return run_scenario(driver)
+        finally:
+            CommandReplayer.end()
+
+    def test_recorded_scenario_replays_deterministically_without_server(self):
+        recorded, commands = self.record()
+        real_sleep = time.sleep
+
+        start = time.perf_counter()
+        first = self.replay()
+        second = self.replay()
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(first, recorded)
+        self.assertEqual(second, recorded)
+        self.assertEqual(CommandReplayer.divergences, [])
+        self.assertEqual(CommandReplayer.replayed, 2 * (commands - 2))  # Without newSession and quit
+        self.assertLess(elapsed, commands * LATENCY)
+        self.assertIs(time.sleep, real_sleep)
+
+    def test_clock_is_restored_when_a_scenario_raises(self):
+        self.record()
+        real_sleep, real_monotonic = time.sleep, time.monotonic
+        driver = CommandReplayer.start_driver("website", CAPABILITIES)
+        CommandReplayer.begin(SCENARIO)
+        try:
+            driver.get("https://example.test/")
+            raise AssertionError("step failed")
+        except AssertionError:
+            pass
+        finally:
+            CommandReplayer.end()
+        self.assertIs(time.sleep, real_sleep)
+        self.assertIs(time.monotonic, real_monotonic)
+        self.assertTrue(CommandReplayer.divergences)  # The rest of the recorded scenario was not replayed
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from behave.model_core import Status
+from behave.runner_util import FileLocationParser, parse_features
+from main.utils.parallel_runner import preserve_order
+
+FEATURE = """Feature: Ordering
+  Scenario: first
+    Given a step
+  Scenario: second
+    Given a step
+  Scenario: third
+    Given a step
+"""
+
+
+class PreserveOrderTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.path = os.path.relpath(os.path.join(directory, "ordering.feature"))
+        with open(self.path, 'w') as file:
+            file.write(FEATURE)
+
+    def run_order(self, locations):
+        """Returns the scenario names behave would run for the locations, in order."""
+        features = parse_features([FileLocationParser.parse(location) for location in locations])
+        return [
+            scenario.name for feature in features for scenario in feature.walk_scenarios()
+            if scenario.status != Status.skipped
+        ]
+
+    def test_longest_first_order_is_kept_within_a_feature(self):
+        locations = [f"{self.path}:6", f"{self.path}:2", f"{self.path}:4"]
+        self.assertEqual(self.run_order(locations), ["first", "second", "third"])
+        self.assertEqual(self.run_order(preserve_order(locations)), ["third", "first", "second"])
+
+    def test_ascending_locations_are_left_unchanged(self):
+        locations = [f"{self.path}:2", f"{self.path}:6", "other.feature:3"]
+        self.assertEqual(preserve_order(locations), locations)
+
+
+if __name__ == "__main__":
+    unittest.main()
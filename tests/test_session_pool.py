@@ -0,0 +1,47 @@
+import unittest
+from appium import webdriver as appium_webdriver
+from selenium import webdriver
+from benchmarks.fake_webdriver_server import FakeWebDriverServer
+from main.utils.session_pool import SessionPool
+
+# The capabilities of a LambdaTest Android session (see device_capabilities/android.json)
+CLOUD_ANDROID = {"platformName": "Android", "deviceName": "Pixel 8", "isRealMobile": True, "name": "Scenario"}
+
+
+class SessionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeWebDriverServer().start()
+        self.pool = SessionPool()
+
+    def tearDown(self):
+        self.pool.quit_all()
+        self.server.stop()
+
+    def acquire(self, factory):
+        return self.pool.acquire("android", "virtual", CLOUD_ANDROID, factory)
+
+    def test_cloud_android_session_is_reused(self):
+        factory = lambda: appium_webdriver.Remote(self.server.url, desired_capabilities=CLOUD_ANDROID)
+        first = self.acquire(factory)
+        session_id = first.session_id
+        self.pool.release(first)
+
+        second = self.acquire(factory)
+        self.assertIs(second, first)
+        self.assertEqual(second.session_id, session_id)
+        paths = [path for _, path, _ in self.server.commands]
+        self.assertEqual(sum(path == "/session" for path in paths), 1)
+        self.assertIn(f"/session/{session_id}/appium/app/reset", paths)
+
+    def test_driver_without_reset_is_not_pooled(self):
+        factory = lambda: webdriver.Remote(self.server.url, desired_capabilities=CLOUD_ANDROID)
+        first = self.acquire(factory)
+        self.pool.release(first)
+
+        second = self.acquire(factory)
+        self.assertIsNot(second, first)
+        self.assertIn(("DELETE", f"/session/{first.session_id}", {}), self.server.commands)
+
+
+if __name__ == "__main__":
+    unittest.main()